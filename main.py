@@ -1,3 +1,9 @@
+import json
+import time
+from pathlib import Path
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -6,22 +12,190 @@ import plotly.express as px
 st.set_page_config(page_title="Minor League Splits Leaderboard", layout="wide")
 
 # === Data Loading Functions ===
-@st.cache_data(ttl=3600)
-def load_hitters_data():
-    url = "https://raw.githubusercontent.com/chrismack698/Minor-League-Rolling-Stats-Leaderboard/main/data/hitters/leaderboard_data.csv"
-    return pd.read_csv(url)
+# Leaderboards are read from the data directory of this checkout when present
+# (the pipeline writes them there), otherwise from the published copy on GitHub.
+LOCAL_DATA_DIR = Path(__file__).resolve().parent / "data"
+DATA_URL = "https://raw.githubusercontent.com/chrismack698/Minor-League-Rolling-Stats-Leaderboard/main/data"
+
+# data/manifest.json holds the SHA-256 of every published file. It is the only
+# remote file revalidated on a timer; everything else is cached by file hash,
+# so unchanged data is never downloaded or parsed again.
+@st.cache_resource
+def manifest_state():
+    return {}
+
+@st.cache_data(ttl=300)
+def load_data_manifest():
+    state = manifest_state()
+    headers = {"If-None-Match": state["etag"]} if state.get("etag") else {}
+    try:
+        with urlopen(Request(f"{DATA_URL}/manifest.json", headers=headers), timeout=30) as response:
+            state["manifest"] = json.load(response)
+            state["etag"] = response.headers.get("ETag")
+    except (OSError, ValueError):
+        # 304 Not Modified (raised by urllib as an HTTPError) or a failed fetch: keep what we have.
+        pass
+    return state.get("manifest")
+
+def local_dataset(name):
+    # A leaderboard is read entirely from the checkout when any of its files are
+    # there, and entirely from GitHub otherwise, so the two are never mixed.
+    local = LOCAL_DATA_DIR / name
+    return any(path.exists() for path in (Path(f"{local}.parquet"), Path(f"{local}.csv"), local / "manifest.json"))
+
+def data_source(path, local):
+    # Location of a data file plus a version for cache keys: the local file's
+    # mtime and size, the published hash, or (with no manifest) the current hour.
+    if local:
+        local_path = LOCAL_DATA_DIR / path
+        stat = local_path.stat() if local_path.exists() else None
+        return str(local_path), (stat.st_mtime_ns, stat.st_size) if stat else None
+    manifest = load_data_manifest()
+    entry = manifest["files"].get(path) if manifest else None
+    version = entry["sha256"] if entry else int(time.time() // 3600)
+    return f"{DATA_URL}/{quote(path)}", version
+
+def is_missing(error):
+    return isinstance(error, FileNotFoundError) or getattr(error, "code", None) == 404
 
-@st.cache_data(ttl=3600)
-def load_pitchers_data():
-    url = "https://raw.githubusercontent.com/chrismack698/Minor-League-Rolling-Stats-Leaderboard/main/data/pitchers/leaderboard_pitch_data.csv"
-    return pd.read_csv(url)
+@st.cache_data(max_entries=64)
+def read_table(location, version, columns, numeric):
+    # All type coercion happens here, once per file version. Only a missing file
+    # is cached (as None); other errors are raised so the next rerun tries again.
+    try:
+        if location.endswith(".csv"):
+            df = pd.read_csv(location, usecols=lambda column: column in columns)
+        else:
+            df = pd.read_parquet(location, columns=columns)
+    except OSError as error:
+        if is_missing(error):
+            return None
+        raise
+    return numeric_columns(df, numeric)
+
+@st.cache_data(max_entries=16)
+def read_json(location, version):
+    try:
+        if location.startswith("http"):
+            with urlopen(location, timeout=30) as response:
+                return json.load(response)
+        return json.loads(Path(location).read_text(encoding="utf-8"))
+    except OSError as error:
+        if is_missing(error):
+            return None
+        raise
+
+def full_leaderboard(name, local, columns, numeric):
+    # Typed Parquet with only the columns the app uses; the CSV is the fallback.
+    for suffix in (".parquet", ".csv"):
+        df = read_table(*data_source(name + suffix, local), columns, numeric)
+        if df is not None:
+            return df
+    return pd.DataFrame(columns=columns)
+
+# The pipeline also splits each leaderboard into one Parquet file per timeframe
+# and level, listed in a manifest, so only the partitions being viewed are read.
+def leaderboard_levels(name, columns, numeric):
+    # Timeframe -> levels that have rows, from the manifest or else from the full leaderboard.
+    local = local_dataset(name)
+    manifest = read_json(*data_source(f"{name}/manifest.json", local))
+    if manifest is not None:
+        pairs = [(part["timeframe"], part["aLevel"]) for part in manifest["partitions"]]
+    else:
+        df = full_leaderboard(name, local, columns, numeric)
+        pairs = df[["timeframe", "aLevel"]].dropna().drop_duplicates().itertuples(index=False)
+    levels = {}
+    for timeframe, level in pairs:
+        levels.setdefault(timeframe, []).append(level)
+    return {timeframe: sorted(level_list) for timeframe, level_list in levels.items()}
+
+def load_leaderboard(name, timeframe, levels, columns, numeric):
+    local = local_dataset(name)
+    manifest = read_json(*data_source(f"{name}/manifest.json", local))
+    if manifest is None:
+        df = full_leaderboard(name, local, columns, numeric)
+        return df[(df['timeframe'] == timeframe) & df['aLevel'].isin(levels)].reset_index(drop=True)
+    parts = [
+        read_table(*data_source(f"{name}/{part['path']}", local), columns, numeric)
+        for part in manifest["partitions"]
+        if part["timeframe"] == timeframe and part["aLevel"] in levels
+    ]
+    parts = [part for part in parts if part is not None]
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+
+def hitter_levels():
+    return leaderboard_levels("hitters/leaderboard_data", HITTER_COLUMNS, HITTER_NUMERIC_COLUMNS)
+
+def pitcher_levels():
+    return leaderboard_levels("pitchers/leaderboard_pitch_data", PITCHER_COLUMNS, PITCHER_NUMERIC_COLUMNS)
+
+def load_hitters_data(timeframe, levels):
+    return load_leaderboard("hitters/leaderboard_data", timeframe, levels, HITTER_COLUMNS, HITTER_NUMERIC_COLUMNS)
+
+def load_pitchers_data(timeframe, levels):
+    return load_leaderboard(
+        "pitchers/leaderboard_pitch_data", timeframe, levels, PITCHER_COLUMNS, PITCHER_NUMERIC_COLUMNS
+    )
+
+# === Column Types and Display Formats ===
+# The pipeline writes rates as numbers (percentages in percent points), so the
+# table only formats the cells it shows.
+HITTER_COLUMN_FORMATS = {
+    "Age": "%.1f",
+    "K%": "%.1f%%",
+    "BB%": "%.1f%%",
+    "AVG": "%.3f",
+    "OBP": "%.3f",
+    "SLG": "%.3f",
+    "OPS": "%.3f",
+    "ISO": "%.3f",
+    "wRC+": "%d",
+    "wOBA": "%.3f",
+    "BABIP": "%.3f",
+}
+PITCHER_COLUMN_FORMATS = {
+    "Age": "%.1f",
+    "IP": "%.1f",
+    "ERA": "%.2f",
+    "WHIP": "%.2f",
+    "FIP": "%.2f",
+    "K/9": "%.2f",
+    "K%": "%.1f%%",
+    "BB%": "%.1f%%",
+    "K-BB%": "%.1f%%",
+    "BABIP": "%.3f",
+    "LOB%": "%.1f%%",
+}
+HITTER_NUMERIC_COLUMNS = ["PA", "HR", "SB", *HITTER_COLUMN_FORMATS]
+PITCHER_NUMERIC_COLUMNS = ["GS", *PITCHER_COLUMN_FORMATS]
+
+HITTER_DISPLAY_COLUMNS = [
+    "player_name", "TeamName", "aLevel", "Age", "AB", "PA", "2B", "3B", "HR",
+    "R", "RBI", "SB", "K%", "BB%", "AVG", "OBP", "SLG", "OPS", "ISO", "wRC+", "wOBA", "BABIP"
+]
+PITCHER_DISPLAY_COLUMNS = [
+    "player_name", "TeamName", "aLevel", "Age", "GS", "IP", "W", "L", "SO",
+    "ERA", "WHIP", "FIP", "K/9", "K%", "BB%", "K-BB%", "BABIP", "LOB%"
+]
+# Everything the filters, table and chart read; other columns are never loaded.
+HITTER_COLUMNS = ["timeframe", *HITTER_DISPLAY_COLUMNS]
+PITCHER_COLUMNS = ["timeframe", *PITCHER_DISPLAY_COLUMNS]
 
 # === Utility Functions ===
 def clean_percentage(series):
     return pd.to_numeric(series.astype(str).str.replace('%', '', regex=False), errors='coerce')
 
-def numeric_series(df, column):
-    return pd.to_numeric(df[column], errors='coerce') if column in df.columns else pd.Series(dtype=float)
+def numeric_columns(df, columns):
+    # Typed CSVs pass straight through; older formatted ones (".312", "24.5%") are parsed once here.
+    for column in columns:
+        if column not in df.columns:
+            df[column] = float("nan")
+        elif not pd.api.types.is_numeric_dtype(df[column]):
+            df[column] = clean_percentage(df[column])
+    return df
+
+def column_formats(formats):
+    return {column: st.column_config.NumberColumn(column, format=fmt) for column, fmt in formats.items()}
 
 def numeric_bounds(series, default_min=0, default_max=100, integer=True):
     clean = pd.to_numeric(series, errors='coerce').dropna()
@@ -43,6 +217,15 @@ def numeric_bounds(series, default_min=0, default_max=100, integer=True):
 
     return min_value, max_value
 
+def load_or_stop(loader, *args):
+    # A failed download or unreadable file is reported instead of crashing the app;
+    # nothing about it is cached, so the next rerun tries again.
+    try:
+        return loader(*args)
+    except (OSError, ValueError) as error:
+        st.error(f"Could not load the leaderboard data: {error}")
+        st.stop()
+
 def range_condition(series, selected_range):
     if selected_range is None:
         return pd.Series(True, index=series.index)
@@ -81,21 +264,28 @@ with st.sidebar:
     }
     
     if st.session_state.active_tab == 'Hitters':
-        # Load hitters data for filter setup
-        df_hitters = load_hitters_data()
-        df_hitters['K%'] = clean_percentage(df_hitters['K%'])
-        df_hitters['BB%'] = clean_percentage(df_hitters['BB%'])
-        for column in ['PA', 'Age', 'HR', 'SB', 'ISO', 'wRC+']:
-            df_hitters[column] = numeric_series(df_hitters, column)
-        
         # === HITTERS FILTERS ===
         # Timeframe
-        available_timeframes = [tf for tf in timeframe_label_map if tf in df_hitters['timeframe'].unique()]
+        levels_by_timeframe_h = load_or_stop(hitter_levels)
+        available_timeframes = [tf for tf in timeframe_label_map if tf in levels_by_timeframe_h]
         sorted_timeframes = sorted(available_timeframes, key=lambda x: int(x.split('_')[1]))
         display_labels = [timeframe_label_map[tf] for tf in sorted_timeframes]
+        if not display_labels:
+            st.info("No leaderboard data is available yet.")
+            st.stop()
         selected_label = st.selectbox("Timeframe", display_labels, key="hitters_timeframe")
         selected_timeframe = {v: k for k, v in timeframe_label_map.items()}[selected_label]
         
+        # Level
+        level_options_h = levels_by_timeframe_h[selected_timeframe]
+        selected_levels_h = st.multiselect("Level", level_options_h, default=level_options_h, key="hitters_level")
+        
+        # Load only the selected timeframe and levels for the remaining filters
+        df_hitters = load_or_stop(load_hitters_data, selected_timeframe, selected_levels_h)
+        if df_hitters.empty:
+            st.info("Select at least one level.")
+            st.stop()
+        
         # Plate Appearances
         min_pa = int(df_hitters.get("PA", pd.Series([0])).min())
         max_pa = int(df_hitters.get("PA", pd.Series([100])).max())
@@ -138,10 +328,6 @@ with st.sidebar:
         iso_range = st.slider("ISO", 0.000, max(0.750, iso_bounds[1] if iso_bounds else 0.750), (0.000, max(0.750, iso_bounds[1] if iso_bounds else 0.750)), key="hitters_iso")
         
         
-        # Level
-        level_options_h = sorted(df_hitters['aLevel'].dropna().unique())
-        selected_levels_h = st.multiselect("Level", level_options_h, default=level_options_h, key="hitters_level")
-
         select_all_h = st.sidebar.checkbox("Select All Players", value=True, key="select_all_players_h")
         
         # Player Name Filter
@@ -161,28 +347,28 @@ with st.sidebar:
         selected_teams_h = st.multiselect("Team", team_options_h, default=team_options_h if select_all_team_h else [], key="hitters_team")
     
     else:  # Pitchers tab
-        # Load pitchers data for filter setup
-        df_pitchers = load_pitchers_data()
-        
-        # Process pitchers data for filters
-        df_pitchers['K%'] = clean_percentage(df_pitchers['K%'])
-        df_pitchers['BB%'] = clean_percentage(df_pitchers['BB%'])
-        df_pitchers['K-BB%'] = clean_percentage(df_pitchers['K-BB%'])
-        df_pitchers['Age'] = pd.to_numeric(df_pitchers['Age'], errors='coerce')
-        df_pitchers['IP'] = pd.to_numeric(df_pitchers['IP'], errors='coerce')
-        df_pitchers['ERA'] = pd.to_numeric(df_pitchers['ERA'], errors='coerce')
-        df_pitchers['FIP'] = pd.to_numeric(df_pitchers['FIP'], errors='coerce')
-        df_pitchers['WHIP'] = pd.to_numeric(df_pitchers['WHIP'], errors='coerce')
-        df_pitchers['GS'] = pd.to_numeric(df_pitchers['GS'], errors='coerce')
-        
         # === PITCHERS FILTERS ===
         # Timeframe
-        available_timeframes_p = [tf for tf in timeframe_label_map if tf in df_pitchers['timeframe'].unique()]
+        levels_by_timeframe_p = load_or_stop(pitcher_levels)
+        available_timeframes_p = [tf for tf in timeframe_label_map if tf in levels_by_timeframe_p]
         sorted_timeframes_p = sorted(available_timeframes_p, key=lambda x: int(x.split('_')[1]))
         display_labels_p = [timeframe_label_map[tf] for tf in sorted_timeframes_p]
+        if not display_labels_p:
+            st.info("No leaderboard data is available yet.")
+            st.stop()
         selected_label_p = st.selectbox("Timeframe", display_labels_p, key="pitchers_timeframe")
         selected_timeframe_p = {v: k for k, v in timeframe_label_map.items()}[selected_label_p]
         
+        # Level
+        level_options_p = levels_by_timeframe_p[selected_timeframe_p]
+        selected_levels_p = st.multiselect("Level", level_options_p, default=level_options_p, key="pitchers_level")
+        
+        # Load only the selected timeframe and levels for the remaining filters
+        df_pitchers = load_or_stop(load_pitchers_data, selected_timeframe_p, selected_levels_p)
+        if df_pitchers.empty:
+            st.info("Select at least one level.")
+            st.stop()
+        
         # Age
         age_bounds_p = numeric_bounds(df_pitchers['Age'])
         if age_bounds_p:
@@ -216,10 +402,6 @@ with st.sidebar:
         max_kbb = float(df_pitchers['K-BB%'].max())
         kbb_range = st.slider("K-BB%", min_kbb, max_kbb, (min_kbb, max_kbb), key="pitchers_kbb")
         
-        # Level
-        level_options_p = sorted(df_pitchers['aLevel'].dropna().unique())
-        selected_levels_p = st.multiselect("Level", level_options_p, default=level_options_p, key="pitchers_level")
-
         select_all_p = st.sidebar.checkbox("Select All Players", value=True, key="select_all_players_p")
         
         # Player Name Filter
@@ -231,16 +413,6 @@ with st.sidebar:
 # === Main Content Based on Active Tab ===
 if st.session_state.active_tab == 'Hitters':
     # === HITTERS CONTENT ===
-    # Process hitters data
-    df_hitters['K%'] = clean_percentage(df_hitters['K%'])
-    df_hitters['BB%'] = clean_percentage(df_hitters['BB%'])
-    df_hitters['PA'] = pd.to_numeric(df_hitters['PA'], errors='coerce')
-    df_hitters['wRC+'] = pd.to_numeric(df_hitters['wRC+'], errors='coerce')
-    df_hitters['Age'] = pd.to_numeric(df_hitters['Age'], errors='coerce')
-    df_hitters['HR'] = pd.to_numeric(df_hitters['HR'], errors='coerce')
-    df_hitters['SB'] = pd.to_numeric(df_hitters['SB'], errors='coerce')
-    df_hitters['ISO'] = pd.to_numeric(df_hitters['ISO'], errors='coerce')
-    
     # Apply filters
     pa_condition = (
         (df_hitters['PA'] >= qualification_thresholds.get(selected_timeframe, 0))
@@ -263,10 +435,7 @@ if st.session_state.active_tab == 'Hitters':
     ]
     
     # Display hitters leaderboard
-    columns_to_display_h = [
-        "player_name", "TeamName", "aLevel", "Age", "AB", "PA", "2B", "3B", "HR",
-        "R", "RBI", "SB", "K%", "BB%", "AVG", "OBP", "SLG", "OPS", "ISO", "wRC+", "wOBA", "BABIP"
-    ]
+    columns_to_display_h = HITTER_DISPLAY_COLUMNS
     
     renamed_columns_h = {
         "player_name": "Name",
@@ -276,6 +445,7 @@ if st.session_state.active_tab == 'Hitters':
     
     st.dataframe(
         filtered_df_h.sort_values("wRC+", ascending=False).reset_index(drop=True)[columns_to_display_h].rename(columns=renamed_columns_h),
+        column_config=column_formats(HITTER_COLUMN_FORMATS),
         use_container_width=True
     )
     
@@ -320,10 +490,7 @@ else:  # Pitchers tab
     ]
     
     # Display pitchers leaderboard
-    columns_to_display_p = [
-        "player_name", "TeamName", "aLevel", "Age", "GS", "IP", "W", "L", "SO",
-        "ERA", "WHIP", "FIP", "K/9", "K%", "BB%", "K-BB%", "BABIP", "LOB%"
-    ]
+    columns_to_display_p = PITCHER_DISPLAY_COLUMNS
     
     renamed_columns_p = {
         "player_name": "Name",
@@ -333,6 +500,7 @@ else:  # Pitchers tab
     
     st.dataframe(
         filtered_df_p.sort_values("K-BB%", ascending=False).reset_index(drop=True)[columns_to_display_p].rename(columns=renamed_columns_p),
+        column_config=column_formats(PITCHER_COLUMN_FORMATS),
         use_container_width=True
     )
     
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the standard library parser is used without it.
+    orjson = None
+
+
+CACHE_BACKENDS = ("sqlite", "json")
+SQLITE_FILENAME = "cache.sqlite3"
+
+
+def json_loads(data: bytes | str) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def json_dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+class CacheStore(ABC):
+    """Raw Stats API response cache keyed by relative names like ``games/12345``."""
+
+    @abstractmethod
+    def get(self, key: str) -> dict[str, Any] | None: ...
+
+    @abstractmethod
+    def put(self, key: str, data: dict[str, Any]) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def keys(self, prefix: str = "") -> Iterator[str]: ...
+
+    def close(self) -> None:
+        pass
+
+
+class JsonDirCache(CacheStore):
+    """Legacy layout: one uncompressed ``{key}.json`` file per response."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        return json_loads(path.read_bytes())
+
+    def put(self, key: str, data: dict[str, Any]) -> None:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        temp_path.write_bytes(json_dumps(data))
+        temp_path.replace(path)
+
+    def delete(self, key: str) -> None:
+        self.path_for(key).unlink(missing_ok=True)
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        # Only walk the directory the prefix points into, not the whole cache.
+        base = self.root / prefix.rpartition("/")[0]
+        if not base.is_dir():
+            return
+        for path in sorted(base.rglob("*.json")):
+            key = path.relative_to(self.root).with_suffix("").as_posix()
+            if key.startswith(prefix):
+                yield key
+
+
+class SqliteCache(CacheStore):
+    """Single-file cache storing zlib-compressed JSON blobs.
+
+    One SQLite file replaces tens of thousands of per-game files: a warm run
+    probes the primary-key index of a single open file instead of doing an
+    open/stat/read per game.
+    """
+
+    def __init__(self, path: Path, compression_level: int = 6) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " data BLOB NOT NULL,"
+            " stored_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+
+    def encode(self, data: dict[str, Any]) -> bytes:
+        return zlib.compress(json_dumps(data), self.compression_level)
+
+    @staticmethod
+    def decode(blob: bytes) -> dict[str, Any]:
+        return json_loads(zlib.decompress(blob))
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+        return self.decode(row[0]) if row else None
+
+    def put(self, key: str, data: dict[str, Any]) -> None:
+        self.put_many([(key, data)])
+
+    def put_many(self, items: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        rows = [(key, self.encode(data), time.time()) for key, data in items]
+        with self._lock:
+            self._connection.execute("BEGIN")
+            self._connection.executemany("INSERT OR REPLACE INTO entries (key, data, stored_at) VALUES (?, ?, ?)", rows)
+            self._connection.execute("COMMIT")
+        return len(rows)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key FROM entries WHERE key >= ? AND key < ? ORDER BY key", (prefix, prefix + "\uffff")
+            ).fetchall()
+        for (key,) in rows:
+            yield key
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class IndexedCache(CacheStore):
+    """Wraps a store with an in-memory set of its keys, listed once at startup.
+
+    Lookups for keys that were never cached are answered from the set without
+    a file stat or SQLite query, and ``keys`` never walks the store again.
+    Assumes this process is the only writer while it runs.
+    """
+
+    def __init__(self, inner: CacheStore) -> None:
+        self.inner = inner
+        self._lock = threading.Lock()
+        self._keys = set(inner.keys())
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        if key not in self._keys:
+            return None
+        return self.inner.get(key)
+
+    def put(self, key: str, data: dict[str, Any]) -> None:
+        self.inner.put(key, data)
+        with self._lock:
+            self._keys.add(key)
+
+    def delete(self, key: str) -> None:
+        self.inner.delete(key)
+        with self._lock:
+            self._keys.discard(key)
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        with self._lock:
+            matches = sorted(key for key in self._keys if key.startswith(prefix))
+        yield from matches
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def open_cache(cache_dir: Path, backend: str, indexed: bool = True) -> CacheStore:
+    if backend == "json":
+        cache: CacheStore = JsonDirCache(cache_dir)
+    elif backend == "sqlite":
+        cache = SqliteCache(cache_dir / SQLITE_FILENAME)
+    else:
+        raise ValueError(f"Unknown cache backend {backend!r}; expected one of {', '.join(CACHE_BACKENDS)}")
+    return IndexedCache(cache) if indexed else cache
+
+
+def migrate_json_cache(cache_dir: Path, target: CacheStore, batch_size: int = 200) -> int:
+    """Copy every legacy ``*.json`` response under ``cache_dir`` into ``target``.
+
+    The JSON files are left in place; delete them once the migrated cache has
+    been used successfully.
+    """
+    source = JsonDirCache(cache_dir)
+    batch: list[tuple[str, dict[str, Any]]] = []
+    migrated = 0
+
+    def flush() -> None:
+        nonlocal migrated
+        if isinstance(target, SqliteCache):
+            target.put_many(batch)
+        else:
+            for key, data in batch:
+                target.put(key, data)
+        migrated += len(batch)
+        batch.clear()
+        print(f"  migrated {migrated} cached responses", flush=True)
+
+    for key in source.keys():
+        data = source.get(key)
+        if data is None:
+            continue
+        batch.append((key, data))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return migrated
@@ -0,0 +1,421 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from mlb_stats_cache import CacheStore, json_loads
+
+
+USER_AGENT = "milb-rolling-leaderboard/1.0"
+PROJECTION_VERSION_KEY = "_projection_version"
+CACHE_META_KEY = "_cache"
+
+
+class RateLimiter:
+    """Token bucket shared by every Stats API request in the process.
+
+    Implemented as a generic cell rate algorithm: each ``acquire`` reserves the
+    next send slot under a lock and then sleeps outside it, so concurrent
+    workers are paced at exactly ``requests_per_second`` in arrival order.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int = 1) -> None:
+        self.requests_per_second = requests_per_second
+        self.burst = max(burst, 1)
+        self._lock = threading.Lock()
+        self._theoretical_arrival = 0.0
+        self._paused_until = 0.0
+
+    def pause_until(self, resume_at: float) -> None:
+        """Hold every caller until ``resume_at`` (``time.monotonic()``), e.g. for ``Retry-After``."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, resume_at)
+
+    def acquire(self) -> None:
+        """Block until a token is available and any ``pause_until`` has passed."""
+        now = time.monotonic()
+        earliest = max(now, self._paused_until)
+        if self.requests_per_second <= 0:
+            send_at = earliest
+        else:
+            interval = 1 / self.requests_per_second
+            tolerance = (self.burst - 1) * interval
+            with self._lock:
+                send_at = max(earliest, self._theoretical_arrival - tolerance)
+                self._theoretical_arrival = max(self._theoretical_arrival, send_at) + interval
+        if send_at > now:
+            time.sleep(send_at - now)
+
+
+class AdaptiveConcurrency:
+    """AIMD controller for the number of Stats API requests in flight.
+
+    Each fast success raises the limit by ``1 / limit`` (about one request per
+    round trip of the whole window). A 429, a 5xx, a connection failure or a
+    latency spike halves it, at most once per ``cooldown`` seconds so a burst
+    of failures from the same window only counts once. With ``adaptive`` off
+    the limit stays at ``maximum``.
+
+    A spike is a response slower than ``latency_spike_factor`` times the
+    baseline latency. The baseline follows the latency average down at once
+    and drifts up by ``baseline_rise`` of the gap per response, so a run that
+    moves from small schedule responses to large boxscores settles on the new
+    normal instead of treating every boxscore as a spike.
+    """
+
+    def __init__(
+        self,
+        maximum: int,
+        adaptive: bool = True,
+        initial: int = 2,
+        minimum: int = 1,
+        latency_spike_factor: float = 3.0,
+        cooldown: float = 2.0,
+        baseline_rise: float = 0.1,
+    ) -> None:
+        self.maximum = max(maximum, 1)
+        self.minimum = max(min(minimum, self.maximum), 1)
+        self.adaptive = adaptive
+        self.limit = float(min(max(initial, self.minimum), self.maximum) if adaptive else self.maximum)
+        self.peak = self.limit
+        self.decreases = 0
+        self.latency_spike_factor = latency_spike_factor
+        self.cooldown = cooldown
+        self.baseline_rise = baseline_rise
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._latency_ewma: float | None = None
+        self._baseline_latency: float | None = None
+        self._last_decrease = 0.0
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, congested: bool) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            if self.adaptive:
+                if congested or self._is_latency_spike(latency):
+                    self._decrease()
+                else:
+                    self.limit = min(self.limit + 1 / self.limit, float(self.maximum))
+                    self.peak = max(self.peak, self.limit)
+                if not congested:
+                    self._observe_latency(latency)
+            self._condition.notify_all()
+
+    def _is_latency_spike(self, latency: float) -> bool:
+        return self._baseline_latency is not None and latency > self._baseline_latency * self.latency_spike_factor
+
+    def _observe_latency(self, latency: float) -> None:
+        self._latency_ewma = latency if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency
+        if self._baseline_latency is None or self._latency_ewma < self._baseline_latency:
+            self._baseline_latency = self._latency_ewma
+        else:
+            self._baseline_latency += self.baseline_rise * (self._latency_ewma - self._baseline_latency)
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.limit / 2, float(self.minimum))
+        self.decreases += 1
+
+    def summary(self) -> str:
+        if not self.adaptive:
+            return f"fixed concurrency {self.maximum}"
+        return (
+            f"adaptive concurrency {int(self.limit)} (peak {int(self.peak)}, max {self.maximum}), "
+            f"{self.decreases} back-offs"
+        )
+
+
+def retry_after_seconds(response: requests.Response) -> float | None:
+    """Parse a ``Retry-After`` header given either as seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@dataclass(frozen=True)
+class FreshnessPolicy:
+    """How long cached responses for one kind of resource are trusted.
+
+    Entries older than ``ttl_seconds`` are revalidated. Resources dated more
+    than ``frozen_after_days`` before today are final and never revalidated.
+    """
+
+    ttl_seconds: float
+    frozen_after_days: int | None = None
+
+    def max_age(self, resource_date: date, today: date) -> float | None:
+        """Return the cache ``max_age`` for a resource, or ``None`` if it is frozen."""
+        if self.frozen_after_days is not None and resource_date < today - timedelta(days=self.frozen_after_days):
+            return None
+        return self.ttl_seconds
+
+
+class ClientStats:
+    """Thread-safe request/connection counters for a :class:`StatsApiClient`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.requests_sent = 0
+        self.connections_opened = 0
+        self.not_modified = 0
+        self.throttled = 0
+        self.bytes_received = 0
+        self.decoded = 0
+        self.decode_seconds = 0.0
+
+    def add(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    @property
+    def connections_reused(self) -> int:
+        return max(self.requests_sent - self.connections_opened, 0)
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests_sent} HTTP requests ({self.not_modified} not modified, {self.throttled} throttled), "
+            f"{self.cache_hits} cache hits; "
+            f"connections opened {self.connections_opened}, reused {self.connections_reused}; "
+            f"{self.bytes_received / 1_048_576:.1f} MiB received"
+        )
+
+
+def counting_pool(pool_cls: type[HTTPConnectionPool], on_new_connection: Callable[[], None]) -> type[HTTPConnectionPool]:
+    class CountingPool(pool_cls):  # type: ignore[misc, valid-type]
+        def _new_conn(self):  # type: ignore[no-untyped-def]
+            on_new_connection()
+            return super()._new_conn()
+
+    return CountingPool
+
+
+class CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every new TCP connection."""
+
+    def __init__(self, on_new_connection: Callable[[], None], **kwargs: Any) -> None:
+        self._on_new_connection = on_new_connection
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": counting_pool(HTTPConnectionPool, self._on_new_connection),
+            "https": counting_pool(HTTPSConnectionPool, self._on_new_connection),
+        }
+
+
+class StatsApiClient:
+    """Shared MLB Stats API client: pooled keep-alive session, rate limit, retries and cache."""
+
+    def __init__(
+        self,
+        cache: CacheStore,
+        rate_limiter: RateLimiter,
+        force_refresh: bool = False,
+        request_timeout: float = 12.0,
+        retries: int = 3,
+        pool_size: int = 4,
+        concurrency: AdaptiveConcurrency | None = None,
+    ) -> None:
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency or AdaptiveConcurrency(pool_size, adaptive=False)
+        self.force_refresh = force_refresh
+        self.request_timeout = request_timeout
+        self.retries = retries
+        self.stats = ClientStats()
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"})
+        adapter = CountingAdapter(
+            lambda: self.stats.add("connections_opened"),
+            pool_connections=2,
+            pool_maxsize=max(pool_size, 1),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+        self.cache.close()
+
+    def __enter__(self) -> StatsApiClient:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def request_json(
+        self,
+        url: str,
+        cache_key: str,
+        projection: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+        projection_version: int | None = None,
+        max_age: float | None = None,
+    ) -> dict[str, Any]:
+        """Return the cached or downloaded JSON for ``url``.
+
+        When ``projection`` is given, only its output is cached, tagged with
+        ``projection_version``. Cached entries with a different tag are
+        refetched; untagged entries are full documents from before projection
+        was enabled and are projected in place without a download.
+
+        ``max_age`` (seconds) makes older cache entries revalidate with a
+        conditional request using the stored ``ETag``/``Last-Modified``; a
+        ``304`` keeps the cached body. ``None`` trusts the cache indefinitely.
+        Every stored entry carries ``CACHE_META_KEY`` metadata, including a
+        content hash callers can compare to detect changed payloads.
+        """
+        cached: dict[str, Any] | None = None
+        if not self.force_refresh:
+            started = time.perf_counter()
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.stats.add("decoded")
+                self.stats.add("decode_seconds", time.perf_counter() - started)
+            if cached is not None and projection is not None:
+                cached_version = cached.get(PROJECTION_VERSION_KEY)
+                if cached_version is None:
+                    cached = self.store(cache_key, cached, None, projection, projection_version)
+                elif cached_version != projection_version:
+                    cached = None
+            if cached is not None:
+                meta = cached.get(CACHE_META_KEY, {})
+                if max_age is None or time.time() - meta.get("fetched_at", 0) < max_age:
+                    self.stats.add("cache_hits")
+                    return cached
+
+        conditional_headers: dict[str, str] = {}
+        if cached is not None:
+            meta = cached.get(CACHE_META_KEY, {})
+            if meta.get("etag"):
+                conditional_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                conditional_headers["If-Modified-Since"] = meta["last_modified"]
+
+        response, data = self.get(url, conditional_headers)
+        if data is None and cached is not None:
+            self.stats.add("not_modified")
+            cached[CACHE_META_KEY] = {**cached.get(CACHE_META_KEY, {}), "fetched_at": time.time()}
+            self.cache.put(cache_key, cached)
+            return cached
+        if data is None:
+            raise RuntimeError(f"Unexpected 304 Not Modified without a cached entry: {url}")
+        return self.store(cache_key, data, response, projection, projection_version)
+
+    def fetch_json(self, url: str) -> dict[str, Any]:
+        """Download ``url`` through the rate limiter and retry policy, bypassing the cache."""
+        _, data = self.get(url)
+        if data is None:
+            raise RuntimeError(f"Unexpected 304 Not Modified: {url}")
+        return data
+
+    def get(
+        self, url: str, headers: dict[str, str] | None = None
+    ) -> tuple[requests.Response, dict[str, Any] | None]:
+        """GET ``url`` with retries; the parsed body is ``None`` for ``304 Not Modified``."""
+        last_error: Exception | None = None
+
+        for attempt in range(1, self.retries + 1):
+            self.rate_limiter.acquire()
+            self.concurrency.acquire()
+            started = time.monotonic()
+            latency: float | None = None
+            congested = True
+            retry_after: float | None = None
+            retry_at: float | None = None
+            try:
+                self.stats.add("requests_sent")
+                response = self.session.get(url, headers=headers, timeout=(5, self.request_timeout))
+                body = response.content
+                latency = time.monotonic() - started
+                # raw.tell() counts body bytes as sent on the wire, i.e. before gzip decoding.
+                self.stats.add("bytes_received", response.raw.tell() if response.raw else len(body))
+                congested = response.status_code == 429 or response.status_code >= 500
+                if response.status_code == 429:
+                    self.stats.add("throttled")
+                    retry_after = retry_after_seconds(response)
+                response.raise_for_status()
+                if response.status_code == 304:
+                    return response, None
+                decode_started = time.perf_counter()
+                data = json_loads(body)
+                self.stats.add("decoded")
+                self.stats.add("decode_seconds", time.perf_counter() - decode_started)
+                return response, data
+            except (requests.RequestException, ValueError) as exc:
+                last_error = exc
+                if retry_after is not None:
+                    # The server asked everyone to wait, not just this request.
+                    self.rate_limiter.pause_until(time.monotonic() + retry_after)
+                if attempt < self.retries:
+                    sleep_for = retry_after if retry_after is not None else min(2 ** (attempt - 1), 8)
+                    print(f"Request failed ({attempt}/{self.retries}); retrying in {sleep_for:g}s: {url}", flush=True)
+                    retry_at = time.monotonic() + sleep_for
+            finally:
+                # Latency covers the round trip and body download, not JSON decoding.
+                self.concurrency.release(time.monotonic() - started if latency is None else latency, congested)
+            if retry_at is not None:
+                # Only this request backs off; it takes a normal token once the wait is over.
+                time.sleep(max(retry_at - time.monotonic(), 0))
+
+        raise RuntimeError(f"Failed after {self.retries} attempts: {url}") from last_error
+
+    def store(
+        self,
+        cache_key: str,
+        data: dict[str, Any],
+        response: requests.Response | None,
+        projection: Callable[[dict[str, Any]], dict[str, Any]] | None,
+        projection_version: int | None,
+    ) -> dict[str, Any]:
+        """Project ``data`` if requested, stamp cache metadata and write it to the cache."""
+        previous_meta = data.get(CACHE_META_KEY, {})
+        if projection is not None:
+            data = projection(data)
+            data[PROJECTION_VERSION_KEY] = projection_version
+        data.pop(CACHE_META_KEY, None)
+        data[CACHE_META_KEY] = {
+            "fetched_at": time.time() if response is not None else previous_meta.get("fetched_at", 0),
+            "etag": response.headers.get("ETag") if response is not None else previous_meta.get("etag"),
+            "last_modified": (
+                response.headers.get("Last-Modified") if response is not None else previous_meta.get("last_modified")
+            ),
+            "hash": content_hash(data),
+        }
+        self.cache.put(cache_key, data)
+        return data
+
+
+def content_hash(data: dict[str, Any]) -> str:
+    body = {key: value for key, value in data.items() if key != CACHE_META_KEY}
+    return hashlib.sha1(json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
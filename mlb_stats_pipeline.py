@@ -1,15 +1,31 @@
 from __future__ import annotations
 
 import argparse
-import hashlib
-import json
+from array import array
+import threading
 import time
+from collections import defaultdict, deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, TypeVar
 
+import numpy as np
 import pandas as pd
-import requests
+
+from mlb_stats_cache import CACHE_BACKENDS, SQLITE_FILENAME, SqliteCache, migrate_json_cache, open_cache
+from mlb_stats_client import CACHE_META_KEY, AdaptiveConcurrency, FreshnessPolicy, RateLimiter, StatsApiClient
+from mlb_stats_store import (
+    RUN_MANIFEST_FILENAME,
+    GameLogStore,
+    OutputPublisher,
+    PrefixSumIndex,
+    RunManifest,
+    parquet_bytes,
+    plain_columns,
+    write_partitions,
+)
 
 
 BASE_URL = "https://statsapi.mlb.com/api/v1"
@@ -26,6 +42,188 @@ SPORT_LEVELS = {
 
 DEFAULT_SPORT_IDS = tuple(SPORT_LEVELS)
 DEFAULT_WINDOWS = (7, 15, 30, 45, 60)
+# Descriptive columns carried into leaderboards from each player's latest game.
+FIRST_VALUE_COLS = ("player_name", "Age", "TeamName", "Team", "aLevel", "league_id", "league_name")
+# Counting stats summed over leaderboard windows.
+HITTER_COUNT_COLS = [
+    "G",
+    "AB",
+    "PA",
+    "H",
+    "1B",
+    "2B",
+    "3B",
+    "HR",
+    "R",
+    "RBI",
+    "BB",
+    "IBB",
+    "SO",
+    "HBP",
+    "SF",
+    "SH",
+    "GDP",
+    "SB",
+    "CS",
+]
+# Boxscore stat keys in HITTER_COUNT_COLS order; 1B (None) is derived from the hit types.
+HITTER_STAT_KEYS = (
+    "gamesPlayed",
+    "atBats",
+    "plateAppearances",
+    "hits",
+    None,
+    "doubles",
+    "triples",
+    "homeRuns",
+    "runs",
+    "rbi",
+    "baseOnBalls",
+    "intentionalWalks",
+    "strikeOuts",
+    "hitByPitch",
+    "sacFlies",
+    "sacBunts",
+    "groundIntoDoublePlay",
+    "stolenBases",
+    "caughtStealing",
+)
+PITCHER_COUNT_COLS = [
+    "GS",
+    "W",
+    "L",
+    "CG",
+    "ShO",
+    "SV",
+    "outs",
+    "TBF",
+    "H",
+    "R",
+    "ER",
+    "HR",
+    "BB",
+    "IBB",
+    "HBP",
+    "WP",
+    "BK",
+    "SO",
+]
+# Boxscore stat keys in PITCHER_COUNT_COLS order; outs (None) come from inningsPitched.
+PITCHER_STAT_KEYS = (
+    "gamesStarted",
+    "wins",
+    "losses",
+    "completeGames",
+    "shutouts",
+    "saves",
+    None,
+    "battersFaced",
+    "hits",
+    "runs",
+    "earnedRuns",
+    "homeRuns",
+    "baseOnBalls",
+    "intentionalWalks",
+    "hitByPitch",
+    "wildPitches",
+    "balks",
+    "strikeOuts",
+)
+# Repeated strings held as categoricals in game-log frames.
+GAME_LOG_CATEGORY_COLS = ("player_name", "TeamName", "Team", "Opp", "aLevel", "league_name")
+# Per-side columns of GameLogBuilder rows, stored once per team side.
+GAME_LOG_CONTEXT_COLS = ("game_pk", "game_date", "TeamName", "Team", "Opp", "aLevel", "league_id", "league_name")
+# Leaderboard rate columns and their decimal places. Percentages are stored as
+# percent points (24.5, not 0.245); wRC+ is a whole number.
+HITTER_RATE_PLACES = {
+    "AVG": 3,
+    "BB%": 1,
+    "K%": 1,
+    "BB/K": 3,
+    "OBP": 3,
+    "SLG": 3,
+    "OPS": 3,
+    "ISO": 3,
+    "BABIP": 3,
+    "wRC": 1,
+    "wRAA": 1,
+    "wOBA": 3,
+    "wRC+": 0,
+}
+PITCHER_RATE_PLACES = {
+    "ERA": 2,
+    "K/9": 2,
+    "BB/9": 2,
+    "K/BB": 2,
+    "HR/9": 2,
+    "K%": 1,
+    "BB%": 1,
+    "K-BB%": 1,
+    "AVG": 3,
+    "WHIP": 2,
+    "FIP": 2,
+}
+PERCENT_COLS = ("BB%", "K%", "K-BB%")
+# Columns the formatted export keeps as plain numbers.
+UNFORMATTED_RATE_COLS = ("wRC", "wRAA", "wRC+")
+
+# Published Parquet outputs are fetched by the dashboard, so favour size over write speed.
+OUTPUT_PARQUET_COMPRESSION = "zstd"
+# Leaderboards are also split into one Parquet file per timeframe and level.
+LEADERBOARD_PARTITION_COLS = ("timeframe", "aLevel")
+
+# Schedule days this close to today are refetched once their TTL expires, even
+# if every game on them is already final.
+SCHEDULE_RECENT_DAYS = 1
+PEOPLE_INDEX_KEY = "people/index"
+# Placeholder entries for IDs /people did not return are retried after this
+# many days, whatever --people-ttl-days says.
+PEOPLE_MISSING_TTL_DAYS = 1
+
+# Boxscore fields read by extract_game_logs. Cached feed/live documents are
+# projected down to these; bump the version whenever the lists change.
+BOXSCORE_PROJECTION_VERSION = 1
+BOXSCORE_PERSON_FIELDS = ("id", "fullName", "birthDate")
+BOXSCORE_BATTING_FIELDS = (
+    "gamesPlayed",
+    "atBats",
+    "plateAppearances",
+    "hits",
+    "doubles",
+    "triples",
+    "homeRuns",
+    "runs",
+    "rbi",
+    "baseOnBalls",
+    "intentionalWalks",
+    "strikeOuts",
+    "hitByPitch",
+    "sacFlies",
+    "sacBunts",
+    "groundIntoDoublePlay",
+    "stolenBases",
+    "caughtStealing",
+)
+BOXSCORE_PITCHING_FIELDS = (
+    "gamesStarted",
+    "wins",
+    "losses",
+    "completeGames",
+    "shutouts",
+    "saves",
+    "inningsPitched",
+    "battersFaced",
+    "hits",
+    "runs",
+    "earnedRuns",
+    "homeRuns",
+    "baseOnBalls",
+    "intentionalWalks",
+    "hitByPitch",
+    "wildPitches",
+    "balks",
+    "strikeOuts",
+)
 
 # FanGraphs public seasonal constants. These are used as event weights only;
 # league/window baselines are calculated from the downloaded MiLB game logs.
@@ -52,18 +250,89 @@ WOBA_CONSTANTS = {
     },
 }
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Build rolling MiLB leaderboards from MLB Stats API game boxscores."
     )
-    parser.add_argument("--season", type=int, default=date.today().year)
+    parser.add_argument(
+        "--season",
+        type=int,
+        default=None,
+        help="Season whose wOBA constants are used. Default: the year of the last date being reported.",
+    )
     parser.add_argument("--end-date", default=date.today().isoformat())
+    parser.add_argument(
+        "--as-of",
+        default=None,
+        help="Build the rolling leaderboards as of this past date from the stored game logs, without fetching.",
+    )
+    parser.add_argument("--window-start", default=None, help="Start of a custom leaderboard range (with --window-end).")
+    parser.add_argument("--window-end", default=None, help="End of a custom leaderboard range, inclusive.")
     parser.add_argument("--max-window", type=int, default=max(DEFAULT_WINDOWS))
     parser.add_argument("--cache-dir", default="data/raw/mlb_stats_api")
-    parser.add_argument("--delay", type=float, default=0.15)
+    parser.add_argument(
+        "--base-url",
+        default=BASE_URL,
+        help="Stats API v1 root for schedules and people, e.g. a local mlb_stats_standin.py server.",
+    )
+    parser.add_argument("--live-url", default=LIVE_URL, help="Stats API v1.1 root for feed/live boxscores.")
+    parser.add_argument(
+        "--cache-backend",
+        choices=CACHE_BACKENDS,
+        default="sqlite",
+        help="Raw response cache format: one compressed SQLite file, or legacy per-response JSON files.",
+    )
+    parser.add_argument(
+        "--game-log-dir",
+        default="data/game_logs",
+        help="Parquet store of parsed game logs; games already stored here are not re-fetched or re-parsed.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="data",
+        help="Directory for the leaderboard and game-log outputs and their manifest.json. Default: data.",
+    )
+    parser.add_argument(
+        "--checkpoint-games",
+        type=int,
+        default=250,
+        help="Write parsed games to the game-log store and run manifest after this many games. Default: 250.",
+    )
+    parser.add_argument(
+        "--migrate-cache",
+        action="store_true",
+        help="Copy legacy JSON files under --cache-dir into the SQLite cache, then exit.",
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=6.0,
+        help="Stats API request rate shared by all workers. Use 0 for no limit. Default: 6.",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=4,
+        help="Requests allowed back-to-back before --requests-per-second pacing applies. Default: 4.",
+    )
     parser.add_argument("--request-timeout", type=float, default=12.0)
     parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Maximum concurrent schedule/boxscore downloads. Use 1 to fetch serially. Default: 8.",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Adjust concurrency between 1 and --workers from Stats API latency, 429s and 5xx errors.",
+    )
     parser.add_argument(
         "--sport-ids",
         default=",".join(str(sport_id) for sport_id in DEFAULT_SPORT_IDS),
@@ -76,6 +345,40 @@ def parse_args() -> argparse.Namespace:
         help="Stop after this many completed games. Useful for smoke tests.",
     )
     parser.add_argument("--force-refresh", action="store_true")
+    parser.add_argument(
+        "--game-revalidate-days",
+        type=int,
+        default=3,
+        help="Revalidate cached boxscores for games this many days old to pick up stat corrections. Default: 3.",
+    )
+    parser.add_argument(
+        "--game-revalidate-hours",
+        type=float,
+        default=12,
+        help="Minimum hours between revalidations of the same recent boxscore. Default: 12.",
+    )
+    parser.add_argument(
+        "--schedule-ttl-minutes",
+        type=float,
+        default=30,
+        help="Reuse cached schedules for recent or unfinished days for this many minutes. Default: 30.",
+    )
+    parser.add_argument(
+        "--people-ttl-days",
+        type=float,
+        default=0,
+        help="Refetch player biographies older than this many days. Default 0 never refetches them.",
+    )
+    parser.add_argument(
+        "--full-boxscores",
+        action="store_true",
+        help="Cache complete feed/live documents instead of only the boxscore fields the pipeline reads.",
+    )
+    parser.add_argument(
+        "--formatted-csv",
+        action="store_true",
+        help="Also write each leaderboard as *_formatted.csv with rates as strings like .312 and 24.5%%.",
+    )
     return parser.parse_args()
 
 
@@ -84,68 +387,124 @@ def resolve_project_path(path_value: str) -> Path:
     return path if path.is_absolute() else PROJECT_ROOT / path
 
 
-def request_json(
-    url: str,
-    cache_path: Path,
-    delay: float,
-    force_refresh: bool,
-    request_timeout: float,
-    retries: int,
-) -> dict[str, Any]:
-    if cache_path.exists() and not force_refresh:
-        return json.loads(cache_path.read_text(encoding="utf-8"))
+def schedule_cache_key(sport_id: int, day: date) -> str:
+    return f"schedules/{sport_id}/{day.isoformat()}"
 
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
-    last_error: Exception | None = None
 
-    for attempt in range(1, retries + 1):
-        try:
-            response = requests.get(
-                url,
-                headers={"User-Agent": "milb-rolling-leaderboard/1.0"},
-                timeout=(5, request_timeout),
-            )
-            response.raise_for_status()
-            data = response.json()
-            temp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
-            temp_path.write_text(json.dumps(data), encoding="utf-8")
-            temp_path.replace(cache_path)
-            if delay:
-                time.sleep(delay)
-            return data
-        except (requests.RequestException, ValueError) as exc:
-            last_error = exc
-            if attempt < retries:
-                sleep_for = min(2 ** (attempt - 1), 8)
-                print(f"Request failed ({attempt}/{retries}); retrying in {sleep_for}s: {url}", flush=True)
-                time.sleep(sleep_for)
-
-    raise RuntimeError(f"Failed after {retries} attempts: {url}") from last_error
+def schedule_day_is_fresh(
+    schedule_day: dict[str, Any],
+    day: date,
+    today: date,
+    policy: FreshnessPolicy,
+) -> bool:
+    """Frozen days whose games are all settled never expire; other days expire after the policy TTL."""
+    settled = all(
+        is_final_game(game) or game.get("status", {}).get("detailedState") in {"Postponed", "Cancelled"}
+        for game in schedule_day.get("games", [])
+    )
+    if settled and policy.max_age(day, today) is None:
+        return True
+    fetched_at = schedule_day.get(CACHE_META_KEY, {}).get("fetched_at", 0)
+    return time.time() - fetched_at < policy.ttl_seconds
+
+
+def date_runs(days: list[date]) -> list[tuple[date, date]]:
+    """Collapse sorted dates into inclusive ``(start, end)`` runs of consecutive days."""
+    runs: list[tuple[date, date]] = []
+    for day in days:
+        if runs and day == runs[-1][1] + timedelta(days=1):
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
 
 
 def get_schedule(
+    client: StatsApiClient,
     sport_id: int,
     start_date: date,
     end_date: date,
-    cache_dir: Path,
-    delay: float,
-    force_refresh: bool,
-    request_timeout: float,
-    retries: int,
+    policy: FreshnessPolicy,
+    base_url: str = BASE_URL,
+    error_rows: list[dict[str, Any]] | None = None,
 ) -> list[dict[str, Any]]:
-    url = (
-        f"{BASE_URL}/schedule?sportId={sport_id}"
-        f"&startDate={start_date.isoformat()}&endDate={end_date.isoformat()}"
-        "&gameType=R&hydrate=team,venue"
-    )
-    cache_path = cache_dir / "schedules" / f"{sport_id}_{start_date}_{end_date}.json"
-    data = request_json(url, cache_path, delay, force_refresh, request_timeout, retries)
+    """Return the games scheduled between two dates, using per-day cache entries.
+
+    Finalized past days are served from the cache; recent or incomplete days
+    past their TTL are refetched in as few contiguous-range requests as
+    possible. If a refetch fails, the stale cached days are used instead and
+    the failure is added to ``error_rows``; it is raised only when none of
+    those days are cached.
+    """
+    today = date.today()
+    schedule_days: dict[date, dict[str, Any]] = {}
+    stale_days: list[date] = []
+    day = start_date
+    while day <= end_date:
+        cached = None if client.force_refresh else client.cache.get(schedule_cache_key(sport_id, day))
+        if cached is not None and schedule_day_is_fresh(cached, day, today, policy):
+            client.stats.add("cache_hits")
+            schedule_days[day] = cached
+        else:
+            stale_days.append(day)
+        day += timedelta(days=1)
+
+    for run_start, run_end in date_runs(stale_days):
+        url = (
+            f"{base_url}/schedule?sportId={sport_id}"
+            f"&startDate={run_start.isoformat()}&endDate={run_end.isoformat()}"
+            "&gameType=R&hydrate=team,venue"
+        )
+        try:
+            data = client.fetch_json(url)
+        except Exception as exc:
+            fallback = {}
+            for day in stale_days:
+                cached = client.cache.get(schedule_cache_key(sport_id, day)) if run_start <= day <= run_end else None
+                if cached is not None:
+                    fallback[day] = cached
+            if not fallback:
+                raise
+            print(
+                f"sportId {sport_id}: schedule refetch for {run_start} to {run_end} failed; "
+                f"using {len(fallback)} cached days: {exc}",
+                flush=True,
+            )
+            if error_rows is not None:
+                error_rows.append({"scope": "schedule", "sport_id": sport_id, "game_pk": "", "error": str(exc)})
+            schedule_days.update(fallback)
+            continue
+        fetched_at = time.time()
+        fetched = {entry.get("date"): entry for entry in data.get("dates", [])}
+        day = run_start
+        while day <= run_end:
+            # Days without games are omitted by the API; cache them as empty so
+            # they are not requested again.
+            schedule_day = fetched.get(day.isoformat()) or {"date": day.isoformat(), "games": []}
+            schedule_day[CACHE_META_KEY] = {"fetched_at": fetched_at}
+            client.cache.put(schedule_cache_key(sport_id, day), schedule_day)
+            schedule_days[day] = schedule_day
+            day += timedelta(days=1)
+
     games: list[dict[str, Any]] = []
-    for day in data.get("dates", []):
-        games.extend(day.get("games", []))
+    for day in sorted(schedule_days):
+        games.extend(schedule_days[day].get("games", []))
     return games
 
 
+def prune_legacy_cache_entries(client: StatsApiClient) -> int:
+    """Delete date-range schedule entries and SHA-1-chunked ``/people`` entries from older runs."""
+    stale_keys = [key for key in client.cache.keys("schedules/") if "_" in key]
+    stale_keys.extend(key for key in client.cache.keys("people/") if key != PEOPLE_INDEX_KEY)
+    for key in stale_keys:
+        client.cache.delete(key)
+    return len(stale_keys)
+
+
+def schedule_game_date(game: dict[str, Any]) -> date:
+    return datetime.fromisoformat(game["gameDate"].replace("Z", "+00:00")).date()
+
+
 def is_final_game(game: dict[str, Any]) -> bool:
     status = game.get("status", {})
     abstract_state = status.get("abstractGameState", "")
@@ -181,50 +540,177 @@ def display_level(sport_id: int, league_name: str | None) -> str:
     return "R"
 
 
+def project_boxscore(live_data: dict[str, Any]) -> dict[str, Any]:
+    """Reduce a ``feed/live`` document to the subtree ``extract_game_logs`` reads.
+
+    Bump ``BOXSCORE_PROJECTION_VERSION`` whenever this output changes so cached
+    projections are refetched.
+    """
+    teams = live_data.get("liveData", {}).get("boxscore", {}).get("teams", {})
+    projected_teams: dict[str, Any] = {}
+    for side in ("away", "home"):
+        players: dict[str, Any] = {}
+        for player_key, player_blob in teams.get(side, {}).get("players", {}).items():
+            person = player_blob.get("person", {})
+            stats = player_blob.get("stats", {})
+            batting = stats.get("batting", {})
+            pitching = stats.get("pitching", {})
+            players[player_key] = {
+                "person": {key: person[key] for key in BOXSCORE_PERSON_FIELDS if key in person},
+                "stats": {
+                    "batting": {key: batting[key] for key in BOXSCORE_BATTING_FIELDS if key in batting},
+                    "pitching": {key: pitching[key] for key in BOXSCORE_PITCHING_FIELDS if key in pitching},
+                },
+            }
+        projected_teams[side] = {"players": players}
+    return {"gamePk": live_data.get("gamePk"), "liveData": {"boxscore": {"teams": projected_teams}}}
+
+
 def boxscore_for_game(
+    client: StatsApiClient,
     game_pk: int,
-    cache_dir: Path,
-    delay: float,
-    force_refresh: bool,
-    request_timeout: float,
-    retries: int,
+    project: bool = True,
+    max_age: float | None = None,
+    live_url: str = LIVE_URL,
 ) -> dict[str, Any]:
-    url = f"{LIVE_URL}/game/{game_pk}/feed/live"
-    cache_path = cache_dir / "games" / f"{game_pk}.json"
-    return request_json(url, cache_path, delay, force_refresh, request_timeout, retries)
+    url = f"{live_url}/game/{game_pk}/feed/live"
+    if not project:
+        return client.request_json(url, f"games/{game_pk}", max_age=max_age)
+    return client.request_json(
+        url,
+        f"games/{game_pk}",
+        projection=project_boxscore,
+        projection_version=BOXSCORE_PROJECTION_VERSION,
+        max_age=max_age,
+    )
+
+
+def compact_person(person: dict[str, Any], fetched_at: float) -> dict[str, Any]:
+    return {
+        "id": person.get("id"),
+        "fullName": person.get("fullName"),
+        "birthDate": person.get("birthDate"),
+        "batSide": person.get("batSide", {}).get("code"),
+        "pitchHand": person.get("pitchHand", {}).get("code"),
+        "fetched_at": fetched_at,
+    }
 
 
 def people_for_players(
+    client: StatsApiClient,
     player_ids: set[int],
-    cache_dir: Path,
-    delay: float,
-    force_refresh: bool,
-    request_timeout: float,
-    retries: int,
+    ttl_days: float = 0,
+    base_url: str = BASE_URL,
 ) -> dict[int, dict[str, Any]]:
+    """Return biographical data for ``player_ids`` from the per-player index.
+
+    Only players missing from the index (or older than ``ttl_days`` when it is
+    positive, or all of them with ``--force-refresh``) are requested from
+    ``/people``, 100 IDs per request. Entries for other players are kept. IDs
+    the API does not return keep their existing entry or get a placeholder, so
+    they are not requested again on every run; placeholders expire after
+    ``PEOPLE_MISSING_TTL_DAYS``.
+    """
     if not player_ids:
         return {}
 
-    people: dict[int, dict[str, Any]] = {}
-    ids = sorted(player_ids)
+    # The index is always loaded: --force-refresh re-requests these players but
+    # must not drop everyone else's entries when the index is saved.
+    index: dict[str, dict[str, Any]] = client.cache.get(PEOPLE_INDEX_KEY) or {}
+    now = time.time()
+    max_age = ttl_days * 86400
+
+    def is_stale(entry: dict[str, Any]) -> bool:
+        # Placeholders hold nothing but the ID and fetch time.
+        entry_max_age = PEOPLE_MISSING_TTL_DAYS * 86400 if entry.keys() <= {"id", "fetched_at"} else max_age
+        return entry_max_age > 0 and now - entry.get("fetched_at", 0) > entry_max_age
+
+    missing = sorted(
+        player_id
+        for player_id in player_ids
+        if client.force_refresh or str(player_id) not in index or is_stale(index[str(player_id)])
+    )
+    client.stats.add("cache_hits", len(player_ids) - len(missing))
     chunk_size = 100
 
-    for start in range(0, len(ids), chunk_size):
-        chunk = ids[start : start + chunk_size]
-        cache_key = hashlib.sha1(",".join(str(player_id) for player_id in chunk).encode("utf-8")).hexdigest()
-        cache_path = cache_dir / "people" / f"{cache_key}.json"
-        url = f"{BASE_URL}/people?personIds={','.join(str(player_id) for player_id in chunk)}"
-        data = request_json(url, cache_path, delay, force_refresh, request_timeout, retries)
-        for person in data.get("people", []):
-            person_id = person.get("id")
-            if person_id:
-                people[int(person_id)] = person
-
-    return people
+    try:
+        for start in range(0, len(missing), chunk_size):
+            chunk = missing[start : start + chunk_size]
+            url = f"{base_url}/people?personIds={','.join(str(player_id) for player_id in chunk)}"
+            data = client.fetch_json(url)
+            for player_id in chunk:
+                # A refresh that omits a known player keeps the entry it already has.
+                previous = index.get(str(player_id), {"id": player_id})
+                index[str(player_id)] = {**previous, "fetched_at": now}
+            for person in data.get("people", []):
+                person_id = person.get("id")
+                if person_id:
+                    index[str(person_id)] = compact_person(person, now)
+    finally:
+        if missing:
+            client.cache.put(PEOPLE_INDEX_KEY, index)
+
+    return {player_id: index[str(player_id)] for player_id in player_ids if str(player_id) in index}
+
+
+def map_in_order(
+    executor: Executor,
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_in_flight: int,
+) -> Iterator[tuple[T, Future[R]]]:
+    """Submit ``fn`` for each item, yielding futures in input order.
+
+    At most ``max_in_flight`` futures are outstanding, so large payloads that
+    finish ahead of the consumer do not pile up in memory. ``items`` is read
+    lazily, so the output of one ``map_in_order`` stage can feed another.
+    """
+    pending: deque[tuple[T, Future[R]]] = deque()
+    for item in items:
+        pending.append((item, executor.submit(fn, item)))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+class StageTimer:
+    """Accumulates busy time and item counts per pipeline stage across threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.seconds: dict[str, float] = defaultdict(float)
+        self.counts: dict[str, int] = defaultdict(int)
+
+    def add(self, stage: str, seconds: float, count: int = 1) -> None:
+        with self._lock:
+            self.seconds[stage] += seconds
+            self.counts[stage] += count
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def report(self, wall_seconds: float) -> list[str]:
+        lines = []
+        for stage, seconds in self.seconds.items():
+            count = self.counts[stage]
+            rate = count / seconds if seconds else 0.0
+            lines.append(f"  {stage}: {count} in {seconds:.1f}s busy, {rate:.1f}/s per worker")
+        total = self.counts.get("fetch", 0)
+        if wall_seconds:
+            lines.append(f"  fetch/parse wall time: {total} games in {wall_seconds:.1f}s, {total / wall_seconds:.1f} games/s")
+        return lines
 
 
 def int_stat(stats: dict[str, Any], key: str) -> int:
     value = stats.get(key, 0)
+    if type(value) is int:
+        return value
     if value in ("", None, "-.--"):
         return 0
     return int(float(value))
@@ -237,152 +723,186 @@ def parse_ip_to_outs(value: Any) -> int:
     return int(whole or 0) * 3 + int(frac or 0)
 
 
-def outs_to_ip(outs: int) -> str:
-    return f"{outs // 3}.{outs % 3}"
+def fill_ages(df: pd.DataFrame, people: dict[int, dict[str, Any]]) -> pd.DataFrame:
+    """Set ``Age`` on each game-log row from the player's birth date in ``people``.
 
+    Birth dates are parsed once per player and joined onto the rows, so the
+    age arithmetic runs on whole columns.
+    """
+    if df.empty:
+        return df
 
-def outs_to_innings(outs: int) -> float:
-    return outs / 3 if outs else 0.0
+    df = df.copy()
+    birth_dates = pd.to_datetime(
+        pd.Series({player_id: person.get("birthDate") for player_id, person in people.items()}, dtype="object"),
+        format="%Y-%m-%d",
+        errors="coerce",
+    )
+    born = df["player_id"].map(birth_dates)
+    game_dates = pd.to_datetime(df["game_date"], errors="coerce")
+    df["Age"] = ((game_dates - pd.to_datetime(born)).dt.days / 365.25).round(1)
+    return df
 
 
-def player_age(person: dict[str, Any], game_date: date) -> float | None:
-    birth = person.get("birthDate")
-    if not birth:
-        return None
-    try:
-        born = datetime.strptime(birth, "%Y-%m-%d").date()
-    except ValueError:
-        return None
-    return round((game_date - born).days / 365.25, 1)
+class GameLogBuilder:
+    """Column-wise game-log rows for one stat group (hitting or pitching).
+
+    Stats go into one flat ``int32`` buffer in ``stat_cols`` order, and the
+    game/team/league context is stored once per team side with its row count,
+    so no per-row dicts are built. Builders can be merged with ``extend``.
+    """
+
+    def __init__(self, stat_cols: list[str]) -> None:
+        self.stat_cols = stat_cols
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def add_side(self, context: tuple[Any, ...]) -> None:
+        """Start rows for a side; ``context`` follows ``GAME_LOG_CONTEXT_COLS``."""
+        self.sides.append((context, 0))
+
+    def add_row(self, player_id: int, player_name: str | None, values: list[int]) -> None:
+        self.player_ids.append(player_id)
+        self.player_names.append(player_name)
+        self.values.extend(values)
+        context, count = self.sides[-1]
+        self.sides[-1] = (context, count + 1)
+
+    def extend(self, other: GameLogBuilder) -> None:
+        self.values.extend(other.values)
+        self.player_ids.extend(other.player_ids)
+        self.player_names.extend(other.player_names)
+        self.sides.extend(side for side in other.sides if side[1])
+
+    def clear(self) -> None:
+        self.values = array("i")
+        self.player_ids = array("q")
+        self.player_names: list[str | None] = []
+        self.sides: list[tuple[tuple[Any, ...], int]] = []
+
+    def to_frame(self) -> pd.DataFrame:
+        sides = [side for side in self.sides if side[1]]
+        counts = [count for _, count in sides]
+        contexts = list(zip(*(context for context, _ in sides))) or [()] * len(GAME_LOG_CONTEXT_COLS)
+        context = {
+            col: np.repeat(np.array(values, dtype=object), counts)
+            for col, values in zip(GAME_LOG_CONTEXT_COLS, contexts)
+        }
+        stats = np.frombuffer(self.values, dtype=np.int32).reshape(len(self), len(self.stat_cols))
+        frame = pd.DataFrame(
+            {
+                "game_pk": context["game_pk"].astype("int64"),
+                "game_date": context["game_date"],
+                "player_id": np.frombuffer(self.player_ids, dtype=np.int64).copy(),
+                "player_name": self.player_names,
+                "Age": [None] * len(self),  # Set from the people index by fill_ages.
+                "TeamName": context["TeamName"],
+                "Team": context["Team"],
+                "Opp": context["Opp"],
+                "aLevel": context["aLevel"],
+                "league_id": context["league_id"].astype("int64"),
+                "league_name": context["league_name"],
+            }
+        )
+        for position, col in enumerate(self.stat_cols):
+            frame[col] = stats[:, position]
+        return compact_game_logs(frame, self.stat_cols)
 
 
-def fill_ages(df: pd.DataFrame, people: dict[int, dict[str, Any]]) -> pd.DataFrame:
+def compact_game_logs(df: pd.DataFrame, count_cols: list[str]) -> pd.DataFrame:
+    """Apply the in-memory game-log schema.
+
+    Per-game counts are ``int16`` (sums upcast to ``int64``), repeated strings
+    are categoricals, ``Age`` is ``float64`` and ``game_date`` is ``datetime64``.
+    """
     if df.empty:
         return df
+    dtypes: dict[str, str] = {col: "int16" for col in count_cols if col in df.columns}
+    dtypes.update({col: "category" for col in GAME_LOG_CATEGORY_COLS if col in df.columns})
+    df = df.astype(dtypes)
+    df["Age"] = pd.to_numeric(df["Age"], errors="coerce").astype("float64")
+    df["game_date"] = pd.to_datetime(df["game_date"])
+    return df
 
-    df = df.copy()
-    game_dates = pd.to_datetime(df["game_date"], errors="coerce")
-
-    def age_for_row(row_index: int, player_id: Any) -> float | None:
-        person = people.get(int(player_id)) if pd.notna(player_id) else None
-        if not person:
-            return None
-        game_date_value = game_dates.iloc[row_index]
-        if pd.isna(game_date_value):
-            return None
-        return player_age(person, game_date_value.date())
 
-    df["Age"] = [age_for_row(index, player_id) for index, player_id in enumerate(df["player_id"])]
-    return df
+def frame_memory(df: pd.DataFrame) -> str:
+    return f"{len(df)} rows, {df.memory_usage(deep=True).sum() / 2**20:.1f} MiB"
 
 
 def extract_game_logs(
     game: dict[str, Any],
     live_data: dict[str, Any],
     sport_id: int,
-) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    hitters: GameLogBuilder,
+    pitchers: GameLogBuilder,
+) -> None:
+    """Append the game's batting and pitching lines to the two builders."""
     game_pk = game["gamePk"]
-    game_date = datetime.fromisoformat(game["gameDate"].replace("Z", "+00:00")).date()
-    boxscore = live_data.get("liveData", {}).get("boxscore", {})
-    teams = boxscore.get("teams", {})
-
-    hitter_rows: list[dict[str, Any]] = []
-    pitcher_rows: list[dict[str, Any]] = []
+    game_date = schedule_game_date(game)
+    teams = live_data.get("liveData", {}).get("boxscore", {}).get("teams", {})
+    sides = {side: team_context(game, side, sport_id) for side in ("away", "home")}
+
+    for side, opponent in (("away", "home"), ("home", "away")):
+        context = sides[side]
+        opponent_context = sides[opponent]
+        side_context = (
+            game_pk,
+            game_date,
+            context["team_name"],
+            context["team_abbreviation"] or context["team_name"],
+            opponent_context["team_abbreviation"] or opponent_context["team_name"],
+            context["aLevel"],
+            context["league_id"] or sport_id,
+            context["league_name"],
+        )
+        hitters.add_side(side_context)
+        pitchers.add_side(side_context)
 
-    for side in ("away", "home"):
-        context = team_context(game, side, sport_id)
-        opponent_context = team_context(game, "home" if side == "away" else "away", sport_id)
-        team_box = teams.get(side, {})
-        for player_blob in team_box.get("players", {}).values():
+        for player_blob in teams.get(side, {}).get("players", {}).values():
             person = player_blob.get("person", {})
             person_id = person.get("id")
             if not person_id:
                 continue
+            stats = player_blob.get("stats", {})
 
-            common = {
-                "game_pk": game_pk,
-                "game_date": game_date,
-                "player_id": person_id,
-                "player_name": person.get("fullName"),
-                "Age": player_age(person, game_date),
-                "TeamName": context["team_name"],
-                "Team": context["team_abbreviation"] or context["team_name"],
-                "Opp": opponent_context["team_abbreviation"] or opponent_context["team_name"],
-                "aLevel": context["aLevel"],
-                "league_id": context["league_id"] or sport_id,
-                "league_name": context["league_name"],
-            }
-
-            batting = player_blob.get("stats", {}).get("batting", {})
+            batting = stats.get("batting", {})
             if batting and int_stat(batting, "plateAppearances") > 0:
-                h = int_stat(batting, "hits")
-                doubles = int_stat(batting, "doubles")
-                triples = int_stat(batting, "triples")
-                hr = int_stat(batting, "homeRuns")
-                hitter_rows.append(
-                    {
-                        **common,
-                        "G": int_stat(batting, "gamesPlayed") or 1,
-                        "AB": int_stat(batting, "atBats"),
-                        "PA": int_stat(batting, "plateAppearances"),
-                        "H": h,
-                        "1B": max(h - doubles - triples - hr, 0),
-                        "2B": doubles,
-                        "3B": triples,
-                        "HR": hr,
-                        "R": int_stat(batting, "runs"),
-                        "RBI": int_stat(batting, "rbi"),
-                        "BB": int_stat(batting, "baseOnBalls"),
-                        "IBB": int_stat(batting, "intentionalWalks"),
-                        "SO": int_stat(batting, "strikeOuts"),
-                        "HBP": int_stat(batting, "hitByPitch"),
-                        "SF": int_stat(batting, "sacFlies"),
-                        "SH": int_stat(batting, "sacBunts"),
-                        "GDP": int_stat(batting, "groundIntoDoublePlay"),
-                        "SB": int_stat(batting, "stolenBases"),
-                        "CS": int_stat(batting, "caughtStealing"),
-                    }
-                )
-
-            pitching = player_blob.get("stats", {}).get("pitching", {})
-            if pitching and parse_ip_to_outs(pitching.get("inningsPitched")) > 0:
-                pitcher_rows.append(
-                    {
-                        **common,
-                        "GS": int_stat(pitching, "gamesStarted"),
-                        "W": int_stat(pitching, "wins"),
-                        "L": int_stat(pitching, "losses"),
-                        "CG": int_stat(pitching, "completeGames"),
-                        "ShO": int_stat(pitching, "shutouts"),
-                        "SV": int_stat(pitching, "saves"),
-                        "outs": parse_ip_to_outs(pitching.get("inningsPitched")),
-                        "TBF": int_stat(pitching, "battersFaced"),
-                        "H": int_stat(pitching, "hits"),
-                        "R": int_stat(pitching, "runs"),
-                        "ER": int_stat(pitching, "earnedRuns"),
-                        "HR": int_stat(pitching, "homeRuns"),
-                        "BB": int_stat(pitching, "baseOnBalls"),
-                        "IBB": int_stat(pitching, "intentionalWalks"),
-                        "HBP": int_stat(pitching, "hitByPitch"),
-                        "WP": int_stat(pitching, "wildPitches"),
-                        "BK": int_stat(pitching, "balks"),
-                        "SO": int_stat(pitching, "strikeOuts"),
-                    }
-                )
-
-    return hitter_rows, pitcher_rows
-
-
-def safe_div(numerator: float, denominator: float) -> float | None:
-    if not denominator:
-        return None
-    return numerator / denominator
+                values = [int_stat(batting, key) if key else 0 for key in HITTER_STAT_KEYS]
+                # G defaults to 1; 1B = H - 2B - 3B - HR.
+                values[0] = values[0] or 1
+                values[4] = max(values[3] - values[5] - values[6] - values[7], 0)
+                hitters.add_row(person_id, person.get("fullName"), values)
+
+            pitching = stats.get("pitching", {})
+            outs = parse_ip_to_outs(pitching.get("inningsPitched")) if pitching else 0
+            if outs > 0:
+                values = [int_stat(pitching, key) if key else outs for key in PITCHER_STAT_KEYS]
+                pitchers.add_row(person_id, person.get("fullName"), values)
+
+
+def parse_game(
+    sport_id: int, game: dict[str, Any], live_data: dict[str, Any]
+) -> tuple[GameLogBuilder, GameLogBuilder, float]:
+    """Extract stage of ``main``: one game's logs in fresh builders, so a failure leaves no partial rows."""
+    started = time.perf_counter()
+    hitters = GameLogBuilder(HITTER_COUNT_COLS)
+    pitchers = GameLogBuilder(PITCHER_COUNT_COLS)
+    extract_game_logs(game, live_data, sport_id, hitters, pitchers)
+    return hitters, pitchers, time.perf_counter() - started
 
 
 def fmt_decimal(value: float | None, places: int = 3) -> str:
     if value is None or pd.isna(value):
         return ""
-    return f"{value:.{places}f}".replace("0.", ".")
+    text = f"{value:.{places}f}"
+    # Drop only a leading zero (".312", "-.050"); "10.64" keeps its digits.
+    if text.startswith("0."):
+        return text[1:]
+    if text.startswith("-0."):
+        return "-" + text[2:]
+    return text
 
 
 def fmt_percent(value: float | None, places: int = 1) -> str:
@@ -391,6 +911,52 @@ def fmt_percent(value: float | None, places: int = 1) -> str:
     return f"{value * 100:.{places}f}%"
 
 
+def divide(numerator: Any, denominator: Any) -> np.ndarray:
+    """Element-wise ``numerator / denominator``, NaN wherever the denominator is zero."""
+    numerator = np.asarray(numerator, dtype="float64")
+    denominator = np.asarray(denominator, dtype="float64")
+    result = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
+
+
+def fmt_decimals(values: np.ndarray, places: int = 3) -> list[str]:
+    return [fmt_decimal(value, places) for value in values.tolist()]
+
+
+def fmt_percents(values: np.ndarray, places: int = 1) -> list[str]:
+    return [fmt_percent(value, places) for value in values.tolist()]
+
+
+def round_rates(leaderboard: pd.DataFrame, places: dict[str, int]) -> None:
+    """Round rate columns in place to the precision they are published with."""
+    for col, digits in places.items():
+        values = leaderboard[col].to_numpy(dtype="float64")
+        rounded = values.round(digits)
+        # np.round scales by 10**digits first, which can turn a value just below
+        # a half-way point into an exact tie; round() those few like the string
+        # formatting does.
+        scaled = values * 10**digits
+        near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        if near_tie.any():
+            rounded[near_tie] = [round(value, digits) for value in values[near_tie].tolist()]
+        leaderboard[col] = pd.array(rounded, dtype="Int64") if digits == 0 else rounded
+
+
+def format_leaderboard(leaderboard: pd.DataFrame, places: dict[str, int]) -> pd.DataFrame:
+    """Legacy string form of a numeric leaderboard: ``.312``, ``24.5%``, blanks for NaN."""
+    formatted = leaderboard.copy()
+    for col, digits in places.items():
+        if col in UNFORMATTED_RATE_COLS:
+            continue
+        values = formatted[col].to_numpy(dtype="float64")
+        if col in PERCENT_COLS:
+            formatted[col] = fmt_percents(values / 100, digits)
+        else:
+            formatted[col] = fmt_decimals(values, digits)
+    return formatted
+
+
 def current_constants(season: int) -> dict[str, float]:
     return WOBA_CONSTANTS.get(season) or WOBA_CONSTANTS[max(WOBA_CONSTANTS)]
 
@@ -407,16 +973,12 @@ def add_hitter_rates(df: pd.DataFrame, season: int) -> pd.DataFrame:
         + constants["wHR"] * df["HR"]
     )
     df["woba_den"] = df["AB"] + df["BB"] - df["IBB"] + df["SF"] + df["HBP"]
-    df["wOBA_raw"] = df.apply(lambda row: safe_div(row["woba_num"], row["woba_den"]), axis=1)
+    df["wOBA_raw"] = divide(df["woba_num"], df["woba_den"])
     return df
 
 
 def aggregate_with_first(df: pd.DataFrame, group_cols: list[str], sum_cols: list[str]) -> pd.DataFrame:
-    first_cols = [
-        col
-        for col in ["player_name", "Age", "TeamName", "Team", "aLevel", "league_id", "league_name"]
-        if col in df.columns and col not in group_cols
-    ]
+    first_cols = [col for col in FIRST_VALUE_COLS if col in df.columns and col not in group_cols]
     agg: dict[str, str] = {col: "sum" for col in sum_cols}
     agg.update({col: "last" for col in first_cols})
     if "game_date" in df.columns:
@@ -424,135 +986,94 @@ def aggregate_with_first(df: pd.DataFrame, group_cols: list[str], sum_cols: list
     return df.groupby(group_cols, as_index=False).agg(agg)
 
 
+def trailing_windows(end_date: date, windows: Iterable[int]) -> dict[str, tuple[date, date]]:
+    """Map ``last_{N}`` timeframe labels to inclusive ``(start, end)`` date ranges."""
+    return {f"last_{window}": (end_date - timedelta(days=window), end_date) for window in windows}
+
+
 def rolling_hitters(game_logs: pd.DataFrame, end_date: date, windows: tuple[int, ...], season: int) -> pd.DataFrame:
     if game_logs.empty:
         return pd.DataFrame()
-
-    numeric_cols = [
-        "G",
-        "AB",
-        "PA",
-        "H",
-        "1B",
-        "2B",
-        "3B",
-        "HR",
-        "R",
-        "RBI",
-        "BB",
-        "IBB",
-        "SO",
-        "HBP",
-        "SF",
-        "SH",
-        "GDP",
-        "SB",
-        "CS",
-    ]
-    rows = []
+    index = PrefixSumIndex.build(game_logs, HITTER_COUNT_COLS, FIRST_VALUE_COLS)
+    return hitter_leaderboard(index, trailing_windows(end_date, windows), season)
+
+
+def hitter_leaderboard(
+    index: PrefixSumIndex,
+    ranges: dict[str, tuple[date, date]],
+    season: int,
+    player_ids: Iterable[int] | None = None,
+) -> pd.DataFrame:
+    """Hitter leaderboard rows for each ``timeframe label -> (start, end)`` range."""
+    numeric_cols = HITTER_COUNT_COLS
     constants = current_constants(season)
+    segments = index.window_sums(ranges.values(), player_ids)
+    if segments.empty:
+        return pd.DataFrame()
 
-    for window in windows:
-        start = end_date - timedelta(days=window)
-        frame = game_logs[(game_logs["game_date"] >= start) & (game_logs["game_date"] <= end_date)]
-        if frame.empty:
-            continue
-
-        frame = add_hitter_rates(frame, season)
-        league = frame.groupby(["league_id"], as_index=False).agg(
-            {
-                "woba_num": "sum",
-                "woba_den": "sum",
-                "R": "sum",
-                "PA": "sum",
-            }
-        )
-        league["league_woba"] = league.apply(lambda row: safe_div(row["woba_num"], row["woba_den"]), axis=1)
-        league["league_r_pa"] = league.apply(lambda row: safe_div(row["R"], row["PA"]), axis=1)
-
-        by_player_league = aggregate_with_first(
-            frame,
-            ["player_id", "league_id"],
-            numeric_cols + ["woba_num", "woba_den"],
-        ).merge(league[["league_id", "league_woba", "league_r_pa"]], on="league_id", how="left")
+    segments = add_hitter_rates(segments, season)
+    league = segments.groupby(["window", "league_id"], as_index=False)[["woba_num", "woba_den", "R", "PA"]].sum()
+    league["league_woba"] = divide(league["woba_num"], league["woba_den"])
+    league["league_r_pa"] = divide(league["R"], league["PA"])
 
-        by_player_league["segment_woba"] = by_player_league.apply(
-            lambda row: safe_div(row["woba_num"], row["woba_den"]), axis=1
-        )
-        by_player_league["segment_wraa"] = by_player_league.apply(
-            lambda row: (
-                ((row["segment_woba"] - row["league_woba"]) / constants["scale"]) * row["PA"]
-                if row["segment_woba"] is not None and row["league_woba"] is not None
-                else 0
-            ),
-            axis=1,
-        )
-        by_player_league["weighted_lg_r_pa"] = by_player_league["league_r_pa"] * by_player_league["PA"]
+    by_player_league = segments.merge(
+        league[["window", "league_id", "league_woba", "league_r_pa"]], on=["window", "league_id"], how="left"
+    )
 
-        player = aggregate_with_first(
-            by_player_league,
-            ["player_id"],
-            numeric_cols + ["woba_num", "woba_den", "segment_wraa", "weighted_lg_r_pa"],
-        )
-        player["timeframe"] = f"last_{window}"
-        player["Date"] = "Total"
-        player["Opp"] = "- - -"
-        player["BO"] = ""
-        player["Pos"] = ""
-        player["AVG"] = player.apply(lambda r: fmt_decimal(safe_div(r["H"], r["AB"])), axis=1)
-        player["BB%"] = player.apply(lambda r: fmt_percent(safe_div(r["BB"], r["PA"])), axis=1)
-        player["K%"] = player.apply(lambda r: fmt_percent(safe_div(r["SO"], r["PA"])), axis=1)
-        player["BB/K"] = player.apply(lambda r: fmt_decimal(safe_div(r["BB"], r["SO"])), axis=1)
-        player["OBP"] = player.apply(
-            lambda r: fmt_decimal(safe_div(r["H"] + r["BB"] + r["HBP"], r["AB"] + r["BB"] + r["HBP"] + r["SF"])),
-            axis=1,
-        )
-        player["SLG"] = player.apply(
-            lambda r: fmt_decimal(safe_div(r["1B"] + 2 * r["2B"] + 3 * r["3B"] + 4 * r["HR"], r["AB"])),
-            axis=1,
-        )
-        player["OPS"] = player.apply(
-            lambda r: fmt_decimal(
-                (safe_div(r["H"] + r["BB"] + r["HBP"], r["AB"] + r["BB"] + r["HBP"] + r["SF"]) or 0)
-                + (safe_div(r["1B"] + 2 * r["2B"] + 3 * r["3B"] + 4 * r["HR"], r["AB"]) or 0)
-            ),
-            axis=1,
-        )
-        player["ISO"] = player.apply(
-            lambda r: fmt_decimal(
-                (safe_div(r["1B"] + 2 * r["2B"] + 3 * r["3B"] + 4 * r["HR"], r["AB"]) or 0)
-                - (safe_div(r["H"], r["AB"]) or 0)
-            ),
-            axis=1,
-        )
-        player["Spd"] = ""
-        player["BABIP"] = player.apply(
-            lambda r: fmt_decimal(safe_div(r["H"] - r["HR"], r["AB"] - r["SO"] - r["HR"] + r["SF"])),
-            axis=1,
-        )
-        player["wSB"] = ""
-        player["wRAA"] = player["segment_wraa"].round(1)
-        player["wOBA"] = player.apply(lambda r: fmt_decimal(safe_div(r["woba_num"], r["woba_den"])), axis=1)
-        player["wRC"] = player.apply(
-            lambda r: round(((r["segment_wraa"] / r["PA"]) + safe_div(r["weighted_lg_r_pa"], r["PA"])) * r["PA"], 1)
-            if r["PA"]
-            else "",
-            axis=1,
-        )
-        player["wRC+"] = player.apply(
-            lambda r: round(
-                (((r["segment_wraa"] / r["PA"]) + safe_div(r["weighted_lg_r_pa"], r["PA"]))
-                 / safe_div(r["weighted_lg_r_pa"], r["PA"]))
-                * 100
-            )
-            if r["PA"] and safe_div(r["weighted_lg_r_pa"], r["PA"])
-            else "",
-            axis=1,
-        )
-        rows.append(player)
+    segment_woba = divide(by_player_league["woba_num"], by_player_league["woba_den"])
+    league_woba = by_player_league["league_woba"].to_numpy(dtype="float64")
+    by_player_league["segment_woba"] = segment_woba
+    # Segments without a wOBA (no PA-type events) contribute no wRAA.
+    by_player_league["segment_wraa"] = np.where(
+        np.isnan(segment_woba) | np.isnan(league_woba),
+        0.0,
+        ((segment_woba - league_woba) / constants["scale"]) * by_player_league["PA"].to_numpy(dtype="float64"),
+    )
+    by_player_league["weighted_lg_r_pa"] = by_player_league["league_r_pa"] * by_player_league["PA"]
 
-    result = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame()
-    return result[
+    player = aggregate_with_first(
+        by_player_league,
+        ["window", "player_id"],
+        numeric_cols + ["woba_num", "woba_den", "segment_wraa", "weighted_lg_r_pa"],
+    )
+    counts = {col: player[col].to_numpy(dtype="float64") for col in numeric_cols}
+    pa = counts["PA"]
+    avg = divide(counts["H"], counts["AB"])
+    obp = divide(
+        counts["H"] + counts["BB"] + counts["HBP"],
+        counts["AB"] + counts["BB"] + counts["HBP"] + counts["SF"],
+    )
+    slg = divide(counts["1B"] + 2 * counts["2B"] + 3 * counts["3B"] + 4 * counts["HR"], counts["AB"])
+    segment_wraa = player["segment_wraa"].to_numpy(dtype="float64")
+    lg_r_pa = divide(player["weighted_lg_r_pa"], pa)
+    wrc = ((segment_wraa / np.where(pa != 0, pa, np.nan)) + lg_r_pa) * pa
+    wrc_plus = (((segment_wraa / np.where(pa != 0, pa, np.nan)) + lg_r_pa) / lg_r_pa) * 100
+    has_wrc = pa != 0
+    has_wrc_plus = has_wrc & (lg_r_pa != 0) & ~np.isnan(lg_r_pa)
+
+    player["timeframe"] = np.array(list(ranges))[player["window"]]
+    player["Date"] = "Total"
+    player["Opp"] = "- - -"
+    player["BO"] = ""
+    player["Pos"] = ""
+    player["AVG"] = avg
+    player["BB%"] = divide(counts["BB"], pa) * 100
+    player["K%"] = divide(counts["SO"], pa) * 100
+    player["BB/K"] = divide(counts["BB"], counts["SO"])
+    player["OBP"] = obp
+    player["SLG"] = slg
+    player["OPS"] = np.nan_to_num(obp) + np.nan_to_num(slg)
+    player["ISO"] = np.nan_to_num(slg) - np.nan_to_num(avg)
+    player["Spd"] = np.nan
+    player["BABIP"] = divide(counts["H"] - counts["HR"], counts["AB"] - counts["SO"] - counts["HR"] + counts["SF"])
+    player["wSB"] = np.nan
+    player["wRAA"] = player["segment_wraa"]
+    player["wOBA"] = divide(player["woba_num"], player["woba_den"])
+    player["wRC"] = np.where(has_wrc, wrc, np.nan)
+    player["wRC+"] = np.where(has_wrc_plus, wrc_plus, np.nan)
+    round_rates(player, HITTER_RATE_PLACES)
+
+    return player[
         [
             "player_name",
             "player_id",
@@ -606,94 +1127,66 @@ def rolling_hitters(game_logs: pd.DataFrame, end_date: date, windows: tuple[int,
 def rolling_pitchers(game_logs: pd.DataFrame, end_date: date, windows: tuple[int, ...]) -> pd.DataFrame:
     if game_logs.empty:
         return pd.DataFrame()
+    index = PrefixSumIndex.build(game_logs, PITCHER_COUNT_COLS, FIRST_VALUE_COLS)
+    return pitcher_leaderboard(index, trailing_windows(end_date, windows))
+
+
+def pitcher_leaderboard(
+    index: PrefixSumIndex,
+    ranges: dict[str, tuple[date, date]],
+    player_ids: Iterable[int] | None = None,
+) -> pd.DataFrame:
+    """Pitcher leaderboard rows for each ``timeframe label -> (start, end)`` range."""
+    numeric_cols = PITCHER_COUNT_COLS
+    segments = index.window_sums(ranges.values(), player_ids)
+    if segments.empty:
+        return pd.DataFrame()
 
-    numeric_cols = [
-        "GS",
-        "W",
-        "L",
-        "CG",
-        "ShO",
-        "SV",
-        "outs",
-        "TBF",
-        "H",
-        "R",
-        "ER",
-        "HR",
-        "BB",
-        "IBB",
-        "HBP",
-        "WP",
-        "BK",
-        "SO",
-    ]
-    rows = []
-
-    for window in windows:
-        start = end_date - timedelta(days=window)
-        frame = game_logs[(game_logs["game_date"] >= start) & (game_logs["game_date"] <= end_date)]
-        if frame.empty:
-            continue
-
-        league = frame.groupby(["league_id"], as_index=False).agg(
-            {"ER": "sum", "HR": "sum", "BB": "sum", "HBP": "sum", "SO": "sum", "outs": "sum"}
-        )
-        league["league_era"] = league.apply(
-            lambda r: safe_div(r["ER"] * 27, r["outs"]),
-            axis=1,
-        )
-        league["league_raw_fip"] = league.apply(
-            lambda r: safe_div(13 * r["HR"] + 3 * (r["BB"] + r["HBP"]) - 2 * r["SO"], outs_to_innings(r["outs"])),
-            axis=1,
-        )
-        league["fip_constant"] = league["league_era"] - league["league_raw_fip"]
-
-        by_player_league = aggregate_with_first(frame, ["player_id", "league_id"], numeric_cols)
-        by_player_league = by_player_league.merge(
-            league[["league_id", "fip_constant"]], on="league_id", how="left"
-        )
-        by_player_league["weighted_fip_constant"] = (
-            by_player_league["fip_constant"] * by_player_league["outs"]
-        )
+    league = segments.groupby(["window", "league_id"], as_index=False)[["ER", "HR", "BB", "HBP", "SO", "outs"]].sum()
+    league["league_era"] = divide(league["ER"] * 27, league["outs"])
+    league["league_raw_fip"] = divide(
+        13 * league["HR"] + 3 * (league["BB"] + league["HBP"]) - 2 * league["SO"], league["outs"] / 3
+    )
+    league["fip_constant"] = league["league_era"] - league["league_raw_fip"]
 
-        player = aggregate_with_first(
-            by_player_league,
-            ["player_id"],
-            numeric_cols + ["weighted_fip_constant"],
-        )
-        player["timeframe"] = f"last_{window}"
-        player["Date"] = "Total"
-        player["Opp"] = "- - -"
-        player["IP"] = player["outs"].apply(outs_to_ip)
-        player["ERA"] = player.apply(lambda r: fmt_decimal(safe_div(r["ER"] * 27, r["outs"]), 2), axis=1)
-        player["WHIP"] = player.apply(
-            lambda r: fmt_decimal(safe_div(r["BB"] + r["H"], outs_to_innings(r["outs"])), 2),
-            axis=1,
-        )
-        player["K/9"] = player.apply(lambda r: fmt_decimal(safe_div(r["SO"] * 27, r["outs"]), 2), axis=1)
-        player["BB/9"] = player.apply(lambda r: fmt_decimal(safe_div(r["BB"] * 27, r["outs"]), 2), axis=1)
-        player["K/BB"] = player.apply(lambda r: fmt_decimal(safe_div(r["SO"], r["BB"]), 2), axis=1)
-        player["HR/9"] = player.apply(lambda r: fmt_decimal(safe_div(r["HR"] * 27, r["outs"]), 2), axis=1)
-        player["K%"] = player.apply(lambda r: fmt_percent(safe_div(r["SO"], r["TBF"])), axis=1)
-        player["BB%"] = player.apply(lambda r: fmt_percent(safe_div(r["BB"], r["TBF"])), axis=1)
-        player["K-BB%"] = player.apply(lambda r: fmt_percent(safe_div(r["SO"] - r["BB"], r["TBF"])), axis=1)
-        player["AVG"] = player.apply(lambda r: fmt_decimal(safe_div(r["H"], max(r["TBF"] - r["BB"] - r["HBP"], 0))), axis=1)
-        player["BABIP"] = ""
-        player["LOB%"] = ""
-        player["FIP"] = player.apply(
-            lambda r: fmt_decimal(
-                safe_div(13 * r["HR"] + 3 * (r["BB"] + r["HBP"]) - 2 * r["SO"], outs_to_innings(r["outs"]))
-                + safe_div(r["weighted_fip_constant"], r["outs"]),
-                2,
-            )
-            if r["outs"] and pd.notna(r["weighted_fip_constant"])
-            else "",
-            axis=1,
-        )
-        rows.append(player)
+    by_player_league = segments.merge(
+        league[["window", "league_id", "fip_constant"]], on=["window", "league_id"], how="left"
+    )
+    by_player_league["weighted_fip_constant"] = (
+        by_player_league["fip_constant"] * by_player_league["outs"]
+    )
 
-    result = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame()
-    return result[
+    player = aggregate_with_first(
+        by_player_league,
+        ["window", "player_id"],
+        numeric_cols + ["weighted_fip_constant"],
+    )
+    player["timeframe"] = np.array(list(ranges))[player["window"]]
+    player["Date"] = "Total"
+    player["Opp"] = "- - -"
+    # Baseball notation: 6.2 is six innings and two outs.
+    player["IP"] = player["outs"] // 3 + (player["outs"] % 3) / 10
+    counts = {col: player[col].to_numpy(dtype="float64") for col in numeric_cols}
+    outs = counts["outs"]
+    innings = outs / 3
+    raw_fip = divide(13 * counts["HR"] + 3 * (counts["BB"] + counts["HBP"]) - 2 * counts["SO"], innings)
+    player["ERA"] = divide(counts["ER"] * 27, outs)
+    player["WHIP"] = divide(counts["BB"] + counts["H"], innings)
+    player["K/9"] = divide(counts["SO"] * 27, outs)
+    player["BB/9"] = divide(counts["BB"] * 27, outs)
+    player["K/BB"] = divide(counts["SO"], counts["BB"])
+    player["HR/9"] = divide(counts["HR"] * 27, outs)
+    player["K%"] = divide(counts["SO"], counts["TBF"]) * 100
+    player["BB%"] = divide(counts["BB"], counts["TBF"]) * 100
+    player["K-BB%"] = divide(counts["SO"] - counts["BB"], counts["TBF"]) * 100
+    player["AVG"] = divide(counts["H"], np.maximum(counts["TBF"] - counts["BB"] - counts["HBP"], 0))
+    player["BABIP"] = np.nan
+    player["LOB%"] = np.nan
+    # NaN where there are no outs or the league has no FIP constant.
+    player["FIP"] = raw_fip + divide(player["weighted_fip_constant"], outs)
+    round_rates(player, PITCHER_RATE_PLACES)
+
+    return player[
         [
             "player_name",
             "player_id",
@@ -739,108 +1232,325 @@ def rolling_pitchers(game_logs: pd.DataFrame, end_date: date, windows: tuple[int
     ]
 
 
+def leaderboards_for_ranges(
+    store: GameLogStore,
+    ranges: dict[str, tuple[date, date]],
+    season: int,
+    player_ids: Iterable[int] | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Hitter and pitcher leaderboards for arbitrary date ranges from the stored prefix sums.
+
+    ``ranges`` maps timeframe labels to inclusive ``(start, end)`` dates, e.g.
+    ``trailing_windows(as_of, DEFAULT_WINDOWS)``. The prefix sums are written
+    by every pipeline run that parses new games.
+    """
+
+    def load_index(kind: str) -> PrefixSumIndex:
+        path = store.prefix_sums_path(kind)
+        if not path.exists():
+            raise FileNotFoundError(f"No {kind} prefix sums at {path}; run the pipeline once to build them.")
+        return PrefixSumIndex.load(path)
+
+    return (
+        hitter_leaderboard(load_index("hitters"), ranges, season, player_ids),
+        pitcher_leaderboard(load_index("pitchers"), ranges, player_ids),
+    )
+
+
+def csv_bytes(frame: pd.DataFrame) -> bytes:
+    return frame.to_csv(index=False).encode("utf-8")
+
+
+def write_table(frame: pd.DataFrame, publisher: OutputPublisher, path: str) -> None:
+    """Publish ``frame`` as the CSV ``path`` and as typed Parquet with the same stem.
+
+    ``path`` is relative to the publisher's root, e.g. ``hitters/player_game_logs.csv``.
+    """
+    publisher.publish(path, csv_bytes(frame))
+    parquet_path = path[: -len(".csv")] + ".parquet"
+    publisher.publish(parquet_path, parquet_bytes(plain_columns(frame), OUTPUT_PARQUET_COMPRESSION))
+
+
+def write_leaderboard(
+    leaderboard: pd.DataFrame,
+    publisher: OutputPublisher,
+    path: str,
+    places: dict[str, int],
+    formatted: bool,
+) -> None:
+    """Publish the numeric leaderboard CSV and Parquet, plus the legacy ``*_formatted.csv`` if requested.
+
+    The partitioned copy goes to a directory named after the CSV, e.g.
+    ``leaderboard_data/last_7/AAA.parquet`` with ``leaderboard_data/manifest.json``.
+    """
+    write_table(leaderboard, publisher, path)
+    stem = path[: -len(".csv")]
+    write_partitions(leaderboard, publisher, stem, LEADERBOARD_PARTITION_COLS, compression=OUTPUT_PARQUET_COMPRESSION)
+    if formatted:
+        publisher.publish(f"{stem}_formatted.csv", csv_bytes(format_leaderboard(leaderboard, places)))
+
+
+def write_range_leaderboards(args: argparse.Namespace) -> None:
+    """Handle ``--as-of`` / ``--window-start`` / ``--window-end`` without fetching anything."""
+    ranges: dict[str, tuple[date, date]] = {}
+    labels = []
+    if args.as_of:
+        as_of = date.fromisoformat(args.as_of)
+        ranges.update(trailing_windows(as_of, DEFAULT_WINDOWS))
+        labels.append(f"as_of_{as_of.isoformat()}")
+    if args.window_start or args.window_end:
+        if not (args.window_start and args.window_end):
+            raise SystemExit("--window-start and --window-end must be given together.")
+        window_start = date.fromisoformat(args.window_start)
+        window_end = date.fromisoformat(args.window_end)
+        label = f"{window_start.isoformat()}_to_{window_end.isoformat()}"
+        ranges[label] = (window_start, window_end)
+        labels.append(label)
+
+    season = args.season or max(end for _, end in ranges.values()).year
+    store = GameLogStore(resolve_project_path(args.game_log_dir))
+    output_hitters, output_pitchers = leaderboards_for_ranges(store, ranges, season)
+    suffix = "_".join(labels)
+    publisher = OutputPublisher(resolve_project_path(args.output_dir))
+    outputs = (
+        (output_hitters, f"hitters/leaderboard_data_{suffix}.csv", HITTER_RATE_PLACES),
+        (output_pitchers, f"pitchers/leaderboard_pitch_data_{suffix}.csv", PITCHER_RATE_PLACES),
+    )
+    for leaderboard, path, places in outputs:
+        write_leaderboard(leaderboard, publisher, path, places, args.formatted_csv)
+        print(f"Wrote {len(leaderboard)} rows to {publisher.root / path}")
+    publisher.save()
+
+
 def main() -> None:
     args = parse_args()
     end_date = datetime.strptime(args.end_date, "%Y-%m-%d").date()
     start_date = end_date - timedelta(days=args.max_window)
     cache_dir = resolve_project_path(args.cache_dir)
     sport_ids = tuple(int(value.strip()) for value in args.sport_ids.split(",") if value.strip())
-
-    hitter_rows: list[dict[str, Any]] = []
-    pitcher_rows: list[dict[str, Any]] = []
+    season = args.season or end_date.year
+
+    if args.migrate_cache:
+        target = SqliteCache(cache_dir / SQLITE_FILENAME)
+        print(f"Migrating JSON cache files under {cache_dir} into {target.path}", flush=True)
+        migrated = migrate_json_cache(cache_dir, target)
+        target.close()
+        print(f"Migrated {migrated} cached responses. The JSON files can now be deleted.")
+        return
+
+    if args.as_of or args.window_start or args.window_end:
+        write_range_leaderboards(args)
+        return
+
+    hitter_logs = GameLogBuilder(HITTER_COUNT_COLS)
+    pitcher_logs = GameLogBuilder(PITCHER_COUNT_COLS)
     error_rows: list[dict[str, Any]] = []
     seen_games: set[int] = set()
+    parsed_games: list[tuple[int, date, int, str | None]] = []
+    parsed_count = 0
+    parsed_since: date | None = None
+    game_log_dir = resolve_project_path(args.game_log_dir)
+    store = GameLogStore(game_log_dir)
+    manifest = RunManifest(
+        game_log_dir / RUN_MANIFEST_FILENAME,
+        {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "sport_ids": list(sport_ids),
+            "limit_games": args.limit_games,
+            "force_refresh": args.force_refresh,
+            "full_boxscores": args.full_boxscores,
+        },
+    )
+    if manifest.resumed:
+        done = sum(1 for game_pk in manifest.games if manifest.is_done(game_pk))
+        print(f"Resuming interrupted run: {done} games already finished", flush=True)
+
+    def checkpoint() -> None:
+        # Persist parsed games so an interrupted run does not lose them.
+        nonlocal parsed_count, parsed_since
+        store.append(parsed_games, hitter_logs.to_frame(), pitcher_logs.to_frame())
+        if parsed_games:
+            earliest = min(game_date for _, game_date, *_ in parsed_games)
+            parsed_since = earliest if parsed_since is None else min(parsed_since, earliest)
+        for game_pk, *_ in parsed_games:
+            manifest.mark(game_pk, "written")
+        manifest.save()
+        parsed_count += len(parsed_games)
+        parsed_games.clear()
+        hitter_logs.clear()
+        pitcher_logs.clear()
 
     print(
         f"Fetching MiLB games from {start_date} through {end_date} for sport IDs {sport_ids}",
         flush=True,
     )
 
-    stop_requested = False
-    for sport_id in sport_ids:
-        try:
-            games = get_schedule(
-                sport_id,
-                start_date,
-                end_date,
-                cache_dir,
-                args.delay,
-                args.force_refresh,
-                args.request_timeout,
-                args.retries,
-            )
-        except Exception as exc:
-            print(f"Skipping sportId {sport_id}: schedule fetch failed: {exc}", flush=True)
-            error_rows.append({"scope": "schedule", "sport_id": sport_id, "game_pk": "", "error": str(exc)})
-            continue
-
-        final_games = [
-            game
-            for game in games
-            if game.get("gamePk") and game.get("gamePk") not in seen_games and is_final_game(game)
-        ]
-        print(f"sportId {sport_id}: {len(final_games)} completed games to process", flush=True)
-
-        for index, game in enumerate(final_games, start=1):
-            game_pk = game.get("gamePk")
-            if not game_pk or game_pk in seen_games:
-                continue
-            seen_games.add(game_pk)
-
-            away = game.get("teams", {}).get("away", {}).get("team", {}).get("name", "Away")
-            home = game.get("teams", {}).get("home", {}).get("team", {}).get("name", "Home")
-            print(
-                f"  [{index}/{len(final_games)}] gamePk {game_pk}: {away} at {home}",
-                flush=True,
+    workers = max(args.workers, 1)
+    run_started = time.perf_counter()
+    stages = StageTimer()
+    today = date.today()
+    schedule_policy = FreshnessPolicy(args.schedule_ttl_minutes * 60, SCHEDULE_RECENT_DAYS)
+    game_policy = FreshnessPolicy(args.game_revalidate_hours * 3600, args.game_revalidate_days)
+    client = StatsApiClient(
+        open_cache(cache_dir, args.cache_backend),
+        RateLimiter(args.requests_per_second, args.burst),
+        force_refresh=args.force_refresh,
+        request_timeout=args.request_timeout,
+        retries=args.retries,
+        pool_size=workers,
+        concurrency=AdaptiveConcurrency(workers, adaptive=args.adaptive),
+    )
+    pruned = prune_legacy_cache_entries(client)
+    if pruned:
+        print(f"Removed {pruned} legacy schedule/people cache entries", flush=True)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        schedule_futures = {
+            sport_id: executor.submit(
+                get_schedule, client, sport_id, start_date, end_date, schedule_policy, args.base_url, error_rows
             )
+            for sport_id in sport_ids
+        }
 
+        queued_games: list[tuple[int, dict[str, Any], int, int]] = []
+        for sport_id in sport_ids:
             try:
-                live_data = boxscore_for_game(
-                    game_pk,
-                    cache_dir,
-                    args.delay,
-                    args.force_refresh,
-                    args.request_timeout,
-                    args.retries,
-                )
-                hitters, pitchers = extract_game_logs(game, live_data, sport_id)
+                games = schedule_futures[sport_id].result()
             except Exception as exc:
-                print(f"    skipped gamePk {game_pk}: {exc}", flush=True)
-                error_rows.append(
-                    {"scope": "game", "sport_id": sport_id, "game_pk": game_pk, "error": str(exc)}
-                )
+                print(f"Skipping sportId {sport_id}: schedule fetch failed: {exc}", flush=True)
+                error_rows.append({"scope": "schedule", "sport_id": sport_id, "game_pk": "", "error": str(exc)})
                 continue
 
-            hitter_rows.extend(hitters)
-            pitcher_rows.extend(pitchers)
+            final_games = [
+                game
+                for game in games
+                if game.get("gamePk") and game.get("gamePk") not in seen_games and is_final_game(game)
+            ]
+            print(f"sportId {sport_id}: {len(final_games)} completed games to process", flush=True)
+
+            for index, game in enumerate(final_games, start=1):
+                game_pk = game["gamePk"]
+                if game_pk in seen_games:
+                    continue
+                if args.limit_games and len(seen_games) >= args.limit_games:
+                    break
+                seen_games.add(game_pk)
+                queued_games.append((sport_id, game, index, len(final_games)))
 
             if args.limit_games and len(seen_games) >= args.limit_games:
                 print(f"Reached --limit-games {args.limit_games}; stopping early.", flush=True)
-                stop_requested = True
                 break
 
-        if stop_requested:
-            break
+        def game_max_age(game: dict[str, Any]) -> float | None:
+            return game_policy.max_age(schedule_game_date(game), today)
+
+        if not args.force_refresh:
+            # Stored games are only fetched again while still inside the revalidation window.
+            stored_count = sum(1 for queued in queued_games if queued[1]["gamePk"] in store)
+            queued_games = [
+                queued
+                for queued in queued_games
+                if queued[1]["gamePk"] not in store or game_max_age(queued[1]) is not None
+            ]
+            print(
+                f"{stored_count} games already in the game-log store; {len(queued_games)} to fetch or revalidate",
+                flush=True,
+            )
+        if manifest.resumed:
+            queued_games = [queued for queued in queued_games if not manifest.is_done(queued[1]["gamePk"])]
+            print(f"{len(queued_games)} games left after resuming", flush=True)
+
+        # Overlapping stages joined by a bounded queue: worker threads fetch (or
+        # read from cache) and decode boxscores while a generator drops failed and
+        # unchanged games and the main thread extracts game logs from the rest.
+        def fetch_game(queued: tuple[int, dict[str, Any], int, int]) -> dict[str, Any]:
+            game = queued[1]
+            with stages.time("fetch"):
+                return boxscore_for_game(
+                    client,
+                    game["gamePk"],
+                    project=not args.full_boxscores,
+                    max_age=game_max_age(game),
+                    live_url=args.live_url,
+                )
+
+        def changed_games() -> Iterator[tuple[int, dict[str, Any], dict[str, Any], str | None]]:
+            for (sport_id, game, index, total), future in map_in_order(
+                executor, fetch_game, queued_games, workers * 2
+            ):
+                game_pk = game["gamePk"]
+                away = game.get("teams", {}).get("away", {}).get("team", {}).get("name", "Away")
+                home = game.get("teams", {}).get("home", {}).get("team", {}).get("name", "Home")
+                print(
+                    f"  [{index}/{total}] gamePk {game_pk}: {away} at {home}",
+                    flush=True,
+                )
 
-    hitters_df = pd.DataFrame(hitter_rows)
-    pitchers_df = pd.DataFrame(pitcher_rows)
+                try:
+                    live_data = future.result()
+                except Exception as exc:
+                    print(f"    skipped gamePk {game_pk}: {exc}", flush=True)
+                    error_rows.append(
+                        {"scope": "game", "sport_id": sport_id, "game_pk": game_pk, "error": str(exc)}
+                    )
+                    manifest.mark(game_pk, "failed")
+                    continue
+
+                content_hash = live_data.get(CACHE_META_KEY, {}).get("hash")
+                if not args.force_refresh and game_pk in store and store.content_hash(game_pk) == content_hash:
+                    manifest.mark(game_pk, "unchanged")
+                    continue
+                manifest.mark(game_pk, "fetched")
+                yield sport_id, game, live_data, content_hash
+
+        try:
+            for sport_id, game, live_data, content_hash in changed_games():
+                game_pk = game["gamePk"]
+                try:
+                    hitters, pitchers, parse_seconds = parse_game(sport_id, game, live_data)
+                except Exception as exc:
+                    print(f"    skipped gamePk {game_pk}: {exc}", flush=True)
+                    error_rows.append({"scope": "game", "sport_id": sport_id, "game_pk": game_pk, "error": str(exc)})
+                    manifest.mark(game_pk, "failed")
+                    continue
+
+                stages.add("extract", parse_seconds)
+                hitter_logs.extend(hitters)
+                pitcher_logs.extend(pitchers)
+                parsed_games.append((game_pk, schedule_game_date(game), sport_id, content_hash))
+                manifest.mark(game_pk, "parsed")
+                if len(parsed_games) >= max(args.checkpoint_games, 1):
+                    checkpoint()
+        finally:
+            checkpoint()
+
+    manifest.save(complete=True)
+    fetch_parse_seconds = time.perf_counter() - run_started
+    # Only the run's window is read back for the leaderboards. The prefix sums
+    # behind --as-of and custom ranges are rebuilt from the earliest game date
+    # parsed this run, or from the whole store when they do not exist yet.
+    hitters_df = compact_game_logs(store.load("hitters", start_date, end_date, seen_games), HITTER_COUNT_COLS)
+    pitchers_df = compact_game_logs(store.load("pitchers", start_date, end_date, seen_games), PITCHER_COUNT_COLS)
+    stored_range = store.date_range()
+    prefix_updates: dict[str, tuple[date | None, pd.DataFrame]] = {}
+    for kind, count_cols in (("hitters", HITTER_COUNT_COLS), ("pitchers", PITCHER_COUNT_COLS)):
+        if stored_range is None:
+            break
+        if not store.prefix_sums_path(kind).exists():
+            prefix_updates[kind] = (None, compact_game_logs(store.load(kind, *stored_range), count_cols))
+        elif parsed_since is not None:
+            logs = store.load(kind, parsed_since, stored_range[1])
+            prefix_updates[kind] = (parsed_since, compact_game_logs(logs, count_cols))
 
     player_ids = set()
-    if not hitters_df.empty:
-        player_ids.update(int(player_id) for player_id in hitters_df["player_id"].dropna().unique())
-    if not pitchers_df.empty:
-        player_ids.update(int(player_id) for player_id in pitchers_df["player_id"].dropna().unique())
+    for logs in (hitters_df, pitchers_df, *(logs for _, logs in prefix_updates.values())):
+        if not logs.empty:
+            player_ids.update(int(player_id) for player_id in logs["player_id"].dropna().unique())
 
     print(f"Fetching biographical data for {len(player_ids)} players", flush=True)
     try:
-        people = people_for_players(
-            player_ids,
-            cache_dir,
-            args.delay,
-            args.force_refresh,
-            args.request_timeout,
-            args.retries,
-        )
+        people = people_for_players(client, player_ids, args.people_ttl_days, args.base_url)
     except Exception as exc:
         print(f"Age lookup failed; continuing without ages: {exc}", flush=True)
         error_rows.append({"scope": "people", "sport_id": "", "game_pk": "", "error": str(exc)})
@@ -848,30 +1558,53 @@ def main() -> None:
 
     hitters_df = fill_ages(hitters_df, people)
     pitchers_df = fill_ages(pitchers_df, people)
-
-    output_hitters = rolling_hitters(hitters_df, end_date, DEFAULT_WINDOWS, args.season)
+    for kind, (since, logs) in prefix_updates.items():
+        count_cols = HITTER_COUNT_COLS if kind == "hitters" else PITCHER_COUNT_COLS
+        path = store.prefix_sums_path(kind)
+        logs = fill_ages(logs, people)
+        if since is not None:
+            PrefixSumIndex.load(path).rebuilt_from(since, logs).save(path)
+        elif not logs.empty:
+            PrefixSumIndex.build(logs, count_cols, FIRST_VALUE_COLS).save(path)
+
+    output_hitters = rolling_hitters(hitters_df, end_date, DEFAULT_WINDOWS, season)
     output_pitchers = rolling_pitchers(pitchers_df, end_date, DEFAULT_WINDOWS)
 
-    hitters_dir = PROJECT_ROOT / "data" / "hitters"
-    pitchers_dir = PROJECT_ROOT / "data" / "pitchers"
-    hitters_dir.mkdir(parents=True, exist_ok=True)
-    pitchers_dir.mkdir(parents=True, exist_ok=True)
-
+    # Outputs whose content did not change are left untouched; data/manifest.json
+    # records the hash of every published file.
+    publisher = OutputPublisher(resolve_project_path(args.output_dir))
     if not output_hitters.empty:
-        output_hitters.to_csv(hitters_dir / "leaderboard_data.csv", index=False)
-        hitters_df.to_csv(hitters_dir / "player_game_logs.csv", index=False)
+        write_leaderboard(
+            output_hitters, publisher, "hitters/leaderboard_data.csv", HITTER_RATE_PLACES, args.formatted_csv
+        )
+        write_table(hitters_df, publisher, "hitters/player_game_logs.csv")
     if not output_pitchers.empty:
-        output_pitchers.to_csv(pitchers_dir / "leaderboard_pitch_data.csv", index=False)
-        pitchers_df.to_csv(pitchers_dir / "player_pitching_game_logs.csv", index=False)
+        write_leaderboard(
+            output_pitchers, publisher, "pitchers/leaderboard_pitch_data.csv", PITCHER_RATE_PLACES, args.formatted_csv
+        )
+        write_table(pitchers_df, publisher, "pitchers/player_pitching_game_logs.csv")
     if error_rows:
-        pd.DataFrame(error_rows).to_csv(PROJECT_ROOT / "data" / "mlb_stats_api_errors.csv", index=False)
+        publisher.publish("mlb_stats_api_errors.csv", csv_bytes(pd.DataFrame(error_rows)))
+    publisher.save()
+
+    client.close()
 
-    print(f"Games processed: {len(seen_games)}")
+    print(f"Games processed: {len(seen_games)} ({parsed_count} parsed this run)")
     print(f"Fetch/parse errors: {len(error_rows)}")
+    statuses = manifest.counts()
+    print("Game statuses: " + (", ".join(f"{count} {status}" for status, count in sorted(statuses.items())) or "none"))
     print(f"Hitter game rows: {len(hitters_df)}")
     print(f"Pitcher game rows: {len(pitchers_df)}")
+    print(f"Game logs in memory: hitters {frame_memory(hitters_df)}; pitchers {frame_memory(pitchers_df)}")
     print(f"Hitter leaderboard rows: {len(output_hitters)}")
     print(f"Pitcher leaderboard rows: {len(output_pitchers)}")
+    print(f"Output files: {len(publisher.written)} written, {publisher.unchanged} unchanged")
+    print(f"Stats API: {client.stats.summary()}; {client.concurrency.summary()}")
+    stages.add("decode", client.stats.decode_seconds, client.stats.decoded)
+    print("Stage throughput:")
+    for line in stages.report(fetch_parse_seconds):
+        print(line)
+    print(f"Total run time: {time.perf_counter() - run_started:.1f}s")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from mlb_stats_cache import CACHE_BACKENDS, CacheStore, json_dumps, open_cache
+from mlb_stats_client import CACHE_META_KEY, PROJECTION_VERSION_KEY
+from mlb_stats_pipeline import PEOPLE_INDEX_KEY, resolve_project_path, schedule_cache_key
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Serve recorded Stats API responses from a pipeline cache, for offline fetch benchmarks. "
+            "Point mlb_stats_pipeline.py at it with --base-url/--live-url."
+        )
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default="data/raw/mlb_stats_api",
+        help="Cache recorded by a pipeline run. Use a run with --full-boxscores to replay complete documents.",
+    )
+    parser.add_argument("--cache-backend", choices=CACHE_BACKENDS, default="sqlite")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every response.")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra delay, uniform in 0..N ms.")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests answered with 503.")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="Fraction of requests answered with 429.")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s. Default: 1.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency jitter and injected failures.")
+    return parser.parse_args()
+
+
+def strip_cache_metadata(data: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in data.items() if key not in (CACHE_META_KEY, PROJECTION_VERSION_KEY)}
+
+
+def api_person(entry: dict[str, Any]) -> dict[str, Any] | None:
+    """Rebuild a ``/people`` record from a compacted people-index entry."""
+    if not entry.get("fullName") and not entry.get("birthDate"):
+        # Recorded as "not returned by the API".
+        return None
+    person: dict[str, Any] = {key: entry[key] for key in ("id", "fullName", "birthDate") if entry.get(key)}
+    if entry.get("batSide"):
+        person["batSide"] = {"code": entry["batSide"]}
+    if entry.get("pitchHand"):
+        person["pitchHand"] = {"code": entry["pitchHand"]}
+    return person
+
+
+class FaultInjector:
+    """Latency and failure injection shared by all handler threads."""
+
+    def __init__(
+        self,
+        latency_ms: float,
+        jitter_ms: float,
+        error_rate: float,
+        throttle_rate: float,
+        seed: int | None,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> tuple[float, int | None]:
+        """Return ``(delay_seconds, injected_status)`` for one request."""
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+            roll = self._random.random()
+        status = None
+        if roll < self.throttle_rate:
+            status = 429
+        elif roll < self.throttle_rate + self.error_rate:
+            status = 503
+        return (self.latency_ms + jitter) / 1000, status
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        cache: CacheStore,
+        faults: FaultInjector,
+        retry_after: int,
+    ) -> None:
+        super().__init__(address, StandInHandler)
+        self.cache = cache
+        self.faults = faults
+        self.retry_after = retry_after
+        self.people_index: dict[str, dict[str, Any]] = cache.get(PEOPLE_INDEX_KEY) or {}
+        self.counts: Counter[str] = Counter()
+        self._counts_lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self._counts_lock:
+            self.counts[name] += 1
+
+    def schedule(self, query: dict[str, list[str]]) -> dict[str, Any]:
+        sport_id = query["sportId"][0]
+        day = date.fromisoformat(query["startDate"][0])
+        end_date = date.fromisoformat(query["endDate"][0])
+        dates = []
+        while day <= end_date:
+            cached = self.cache.get(schedule_cache_key(int(sport_id), day))
+            if cached is not None and cached.get("games"):
+                dates.append(strip_cache_metadata(cached))
+            day += timedelta(days=1)
+        return {"dates": dates}
+
+    def live_feed(self, game_pk: str) -> dict[str, Any] | None:
+        cached = self.cache.get(f"games/{game_pk}")
+        return strip_cache_metadata(cached) if cached is not None else None
+
+    def people(self, query: dict[str, list[str]]) -> dict[str, Any]:
+        people = []
+        for person_id in query.get("personIds", [""])[0].split(","):
+            person = api_person(self.people_index.get(person_id.strip(), {}))
+            if person is not None:
+                people.append(person)
+        return {"people": people}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandInServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/_stats":
+            self.send_body(200, json_dumps(dict(self.server.counts)))
+            return
+
+        delay, injected_status = self.server.faults.draw()
+        if delay:
+            time.sleep(delay)
+        self.server.count("requests")
+        if injected_status == 429:
+            self.server.count("throttled")
+            self.send_body(429, b"", {"Retry-After": str(self.server.retry_after)})
+            return
+        if injected_status is not None:
+            self.server.count("errors")
+            self.send_body(injected_status, b"")
+            return
+
+        query = parse_qs(url.query)
+        parts = url.path.rstrip("/").split("/")
+        try:
+            if url.path.endswith("/schedule"):
+                body: dict[str, Any] | None = self.server.schedule(query)
+            elif url.path.endswith("/feed/live") and len(parts) >= 4 and parts[-3].isdigit():
+                body = self.server.live_feed(parts[-3])
+            elif url.path.endswith("/people"):
+                body = self.server.people(query)
+            else:
+                body = None
+        except (KeyError, ValueError):
+            self.server.count("bad_requests")
+            self.send_body(400, b"")
+            return
+        if body is None:
+            self.server.count("not_found")
+            self.send_body(404, b"")
+            return
+
+        payload = json_dumps(body)
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.count("not_modified")
+            self.send_body(304, b"", {"ETag": etag})
+            return
+        headers = {"ETag": etag, "Content-Type": "application/json"}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            payload = gzip.compress(payload, compresslevel=1)
+            headers["Content-Encoding"] = "gzip"
+        self.server.count("ok")
+        self.send_body(200, payload, headers)
+
+    def send_body(self, status: int, payload: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+
+def main() -> None:
+    args = parse_args()
+    cache_dir = resolve_project_path(args.cache_dir)
+    cache = open_cache(cache_dir, args.cache_backend, indexed=False)
+    faults = FaultInjector(args.latency_ms, args.jitter_ms, args.error_rate, args.throttle_rate, args.seed)
+    server = StandInServer((args.host, args.port), cache, faults, args.retry_after)
+    root = f"http://{args.host}:{server.server_address[1]}"
+    print(f"Serving recorded Stats API responses from {cache_dir} at {root}", flush=True)
+    print(f"  python mlb_stats_pipeline.py --base-url {root}/api/v1 --live-url {root}/api/v1.1 ...", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        cache.close()
+        print(f"Requests served: {dict(server.counts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import time
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+GAME_LOG_KINDS = ("hitters", "pitchers")
+GAMES_INDEX_FILENAME = "games.parquet"
+RUN_MANIFEST_FILENAME = "run_manifest.json"
+# Manifest statuses whose games a resumed run does not need to touch again.
+DONE_STATUSES = frozenset({"written", "unchanged"})
+PREFIX_SUMS_DIRNAME = "prefix_sums"
+MANIFEST_FILENAME = "manifest.json"
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def write_parquet_atomic(df: pd.DataFrame, path: Path, compression: str = "snappy") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    df.to_parquet(temp_path, index=False, compression=compression)
+    temp_path.replace(path)
+
+
+def plain_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    """Plain dates and strings in place of the in-memory datetime64 and categorical dtypes.
+
+    Keeps the Parquet schema the same whatever the categories or date range of
+    a given run.
+    """
+    if "game_date" in frame.columns:
+        frame = frame.assign(game_date=pd.to_datetime(frame["game_date"]).dt.date)
+    categories = [col for col in frame.columns if isinstance(frame[col].dtype, pd.CategoricalDtype)]
+    return frame.astype({col: "object" for col in categories})
+
+
+def json_bytes(data: Any) -> bytes:
+    return json.dumps(data, indent=1).encode("utf-8")
+
+
+def write_bytes_atomic(data: bytes, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    temp_path.write_bytes(data)
+    temp_path.replace(path)
+
+
+def write_json_atomic(data: Any, path: Path) -> None:
+    write_bytes_atomic(json_bytes(data), path)
+
+
+def parquet_bytes(frame: pd.DataFrame, compression: str = "snappy") -> bytes:
+    buffer = io.BytesIO()
+    frame.to_parquet(buffer, index=False, compression=compression)
+    return buffer.getvalue()
+
+
+class OutputPublisher:
+    """Publishes output files under ``root``, rewriting only those whose bytes changed.
+
+    ``root/manifest.json`` maps each file's ``root``-relative path to its
+    SHA-256 and size. A file whose new content hashes the same as its entry is
+    left alone, so unchanged outputs keep their mtime and leave no git diff,
+    and readers can compare hashes instead of downloading files again.
+    Changed files are written to a temporary file and renamed into place.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.manifest_path = root / MANIFEST_FILENAME
+        self.files: dict[str, dict[str, Any]] = {}
+        if self.manifest_path.exists():
+            self.files = json.loads(self.manifest_path.read_text(encoding="utf-8")).get("files", {})
+        self.written: list[str] = []
+        self.unchanged = 0
+
+    def publish(self, relative: str, data: bytes) -> str:
+        """Write ``data`` to ``root/relative`` unless it is already there; return its SHA-256."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.root / relative
+        entry = self.files.get(relative)
+        if entry and entry["sha256"] == digest and path.exists() and path.stat().st_size == len(data):
+            self.unchanged += 1
+        else:
+            write_bytes_atomic(data, path)
+            self.written.append(relative)
+        self.files[relative] = {"sha256": digest, "bytes": len(data)}
+        return digest
+
+    def prune(self, directory: str, keep: set[str]) -> None:
+        """Delete files under ``root/directory`` that are not in ``keep``, and their manifest entries."""
+        base = self.root / directory
+        if base.is_dir():
+            for path in base.rglob("*"):
+                if path.is_file() and path.relative_to(self.root).as_posix() not in keep:
+                    path.unlink()
+            for child in sorted(base.rglob("*"), reverse=True):
+                if child.is_dir() and not any(child.iterdir()):
+                    child.rmdir()
+        prefix = directory.rstrip("/") + "/"
+        for relative in [key for key in self.files if key.startswith(prefix) and key not in keep]:
+            del self.files[relative]
+
+    def save(self) -> None:
+        data = json_bytes({"files": dict(sorted(self.files.items()))})
+        if not (self.manifest_path.exists() and self.manifest_path.read_bytes() == data):
+            write_bytes_atomic(data, self.manifest_path)
+
+
+def write_partitions(
+    frame: pd.DataFrame,
+    publisher: OutputPublisher,
+    directory: str,
+    by: Iterable[str],
+    compression: str = "snappy",
+) -> dict[str, Any]:
+    """Publish one Parquet file per combination of ``by`` values, e.g. ``directory/last_7/AAA.parquet``.
+
+    ``directory/manifest.json`` lists each partition's key values, relative
+    path, row count and SHA-256, so readers can fetch only the partitions they
+    need. Partition files left over from earlier runs are removed.
+    """
+    by = list(by)
+    frame = plain_columns(frame)
+    partitions = []
+    for values, part in frame.groupby(by, sort=True, dropna=False):
+        relative = "/".join(str(value) for value in values) + ".parquet"
+        digest = publisher.publish(f"{directory}/{relative}", parquet_bytes(part.reset_index(drop=True), compression))
+        partitions.append({**dict(zip(by, values)), "path": relative, "rows": len(part), "sha256": digest})
+
+    manifest = {"partition_by": by, "columns": list(frame.columns), "partitions": partitions}
+    manifest_path = f"{directory}/{MANIFEST_FILENAME}"
+    publisher.prune(directory, {manifest_path, *(f"{directory}/{part['path']}" for part in partitions)})
+    publisher.publish(manifest_path, json_bytes(manifest))
+    return manifest
+
+
+class GameLogStore:
+    """Parsed player game logs, one Parquet partition per kind and game date.
+
+    ``games.parquet`` records every gamePk that has been parsed (including
+    games that produced no rows) with the content hash of the boxscore it was
+    parsed from, so a run only parses games that are new or whose revalidated
+    boxscore changed, and reads everything else back as typed columns.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.index_path = root / GAMES_INDEX_FILENAME
+        if self.index_path.exists():
+            self.games = pd.read_parquet(self.index_path)
+        else:
+            self.games = pd.DataFrame(
+                {
+                    "game_pk": pd.Series(dtype="int64"),
+                    "game_date": pd.Series(dtype="object"),
+                    "sport_id": pd.Series(dtype="int64"),
+                    "content_hash": pd.Series(dtype="object"),
+                }
+            )
+        if "content_hash" not in self.games.columns:
+            self.games["content_hash"] = None
+        self.content_hashes: dict[int, str | None] = dict(
+            zip(self.games["game_pk"].astype(int), self.games["content_hash"])
+        )
+
+    def partition_path(self, kind: str, game_date: date) -> Path:
+        return self.root / kind / f"{game_date.isoformat()}.parquet"
+
+    def prefix_sums_path(self, kind: str) -> Path:
+        return self.root / PREFIX_SUMS_DIRNAME / f"{kind}.parquet"
+
+    def date_range(self) -> tuple[date, date] | None:
+        """First and last game dates in the store, or ``None`` when it is empty."""
+        if self.games.empty:
+            return None
+        return min(self.games["game_date"]), max(self.games["game_date"])
+
+    def __contains__(self, game_pk: object) -> bool:
+        return game_pk in self.content_hashes
+
+    def content_hash(self, game_pk: int) -> str | None:
+        return self.content_hashes.get(game_pk)
+
+    def append(
+        self,
+        games: Iterable[tuple[int, date, int, str | None]],
+        hitter_logs: pd.DataFrame,
+        pitcher_logs: pd.DataFrame,
+    ) -> None:
+        """Add or replace parsed games given as ``(game_pk, game_date, sport_id, content_hash)``."""
+        new_games = pd.DataFrame(list(games), columns=["game_pk", "game_date", "sport_id", "content_hash"])
+        if new_games.empty:
+            return
+        replaced = set(int(game_pk) for game_pk in new_games["game_pk"])
+
+        for kind, frame in zip(GAME_LOG_KINDS, (hitter_logs, pitcher_logs)):
+            if not frame.empty:
+                frame = plain_columns(frame)
+            touched_dates = set(new_games["game_date"])
+            for game_date in sorted(touched_dates):
+                path = self.partition_path(kind, game_date)
+                parts = []
+                if path.exists():
+                    existing = pd.read_parquet(path)
+                    parts.append(existing[~existing["game_pk"].isin(replaced)])
+                if not frame.empty:
+                    parts.append(frame[frame["game_date"] == game_date])
+                parts = [part for part in parts if not part.empty]
+                if parts:
+                    write_parquet_atomic(pd.concat(parts, ignore_index=True), path)
+                elif path.exists():
+                    path.unlink()
+
+        games_index = pd.concat(
+            [self.games[~self.games["game_pk"].isin(replaced)], new_games], ignore_index=True
+        ).sort_values(["game_date", "game_pk"], ignore_index=True)
+        write_parquet_atomic(games_index, self.index_path)
+        self.games = games_index
+        self.content_hashes.update(zip(new_games["game_pk"].astype(int), new_games["content_hash"]))
+
+    def load(self, kind: str, start_date: date, end_date: date, game_pks: set[int] | None = None) -> pd.DataFrame:
+        """Read ``kind`` game logs for ``start_date..end_date``, optionally limited to ``game_pks``."""
+        parts = []
+        day = start_date
+        while day <= end_date:
+            path = self.partition_path(kind, day)
+            if path.exists():
+                parts.append(pd.read_parquet(path))
+            day += timedelta(days=1)
+        if not parts:
+            return pd.DataFrame()
+        frame = pd.concat(parts, ignore_index=True)
+        if game_pks is not None:
+            frame = frame[frame["game_pk"].isin(game_pks)].reset_index(drop=True)
+        return frame
+
+
+class RunManifest:
+    """Per-game progress of the current run, saved next to the game-log store.
+
+    Each gamePk moves through ``fetched`` -> ``parsed`` -> ``written`` (or ends
+    as ``unchanged`` / ``failed``). The manifest is saved at every store
+    checkpoint; a run started with the same parameters after an interrupted
+    one resumes it and skips the games that were already finished.
+    """
+
+    def __init__(self, path: Path, run_key: dict[str, Any]) -> None:
+        self.path = path
+        self.run_key = run_key
+        self.resumed = False
+        self.games: dict[int, str] = {}
+        self.started_at = time.time()
+        if path.exists():
+            previous = json.loads(path.read_text(encoding="utf-8"))
+            if previous.get("run_key") == run_key and not previous.get("complete"):
+                self.resumed = True
+                self.started_at = previous.get("started_at", self.started_at)
+                self.games = {int(game_pk): status for game_pk, status in previous.get("games", {}).items()}
+
+    def is_done(self, game_pk: int) -> bool:
+        return self.games.get(game_pk) in DONE_STATUSES
+
+    def mark(self, game_pk: int, status: str) -> None:
+        self.games[game_pk] = status
+
+    def counts(self) -> Counter[str]:
+        return Counter(self.games.values())
+
+    def save(self, complete: bool = False) -> None:
+        payload = {
+            "run_key": self.run_key,
+            "started_at": self.started_at,
+            "updated_at": time.time(),
+            "complete": complete,
+            "games": {str(game_pk): status for game_pk, status in sorted(self.games.items())},
+        }
+        write_json_atomic(payload, self.path)
+
+
+class PrefixSumIndex:
+    """Per-(player, league) daily running totals of counting stats.
+
+    ``table`` has one row per segment and game day (``day`` is a proleptic
+    ordinal), sorted by ``player_id``, ``league_id`` and ``day``, holding the
+    segment's totals through that day. Descriptive columns hold the latest
+    non-null value so far, with the day it was recorded in ``{col}_day``. The
+    totals for any date range are the difference of two rows found by binary
+    search, so a query costs the same for a week as for a season.
+    """
+
+    GROUP_COLS = ("player_id", "league_id")
+    # Segment number times this plus the day ordinal gives one sortable search key.
+    KEY_STRIDE = 1_000_000
+
+    def __init__(self, table: pd.DataFrame, sum_cols: list[str], value_cols: list[str]) -> None:
+        self.table = table.reset_index(drop=True)
+        self.sum_cols = sum_cols
+        self.value_cols = value_cols
+        player_ids = self.table["player_id"].to_numpy()
+        league_ids = self.table["league_id"].to_numpy()
+        new_segment = np.r_[True, (player_ids[1:] != player_ids[:-1]) | (league_ids[1:] != league_ids[:-1])]
+        self.segment_starts = np.flatnonzero(new_segment)
+        segments = np.cumsum(new_segment) - 1
+        self.keys = segments * self.KEY_STRIDE + self.table["day"].to_numpy(dtype="int64")
+        self.segment_player_ids = player_ids[self.segment_starts]
+        self.totals = {col: self.table[col].to_numpy() for col in sum_cols}
+
+    @classmethod
+    def build(cls, game_logs: pd.DataFrame, sum_cols: list[str], value_cols: Iterable[str]) -> PrefixSumIndex:
+        """Index ``game_logs`` rows that have a player, league and game date."""
+        group_cols = list(cls.GROUP_COLS)
+        value_cols = [col for col in value_cols if col in game_logs.columns and col not in group_cols]
+        game_dates = pd.to_datetime(game_logs["game_date"], errors="coerce")
+        frame = game_logs[group_cols + sum_cols + value_cols].assign(
+            day=(game_dates - pd.Timestamp(0)).dt.days + UNIX_EPOCH_ORDINAL
+        )
+        frame = frame.dropna(subset=group_cols + ["day"])
+        frame["day"] = frame["day"].astype("int64")
+        if frame.empty:
+            empty = pd.DataFrame(columns=[*group_cols, "day", *sum_cols, *value_cols, *(f"{col}_day" for col in value_cols)])
+            return cls(empty, sum_cols, value_cols)
+
+        # Running totals outgrow the compact int16 game-log counts.
+        daily = frame.groupby(group_cols + ["day"])[sum_cols].sum().astype("int64")
+        table = daily.groupby(level=group_cols).cumsum().reset_index()
+        if value_cols:
+            # Same-day ties keep the order of the logs, like a stable sort by date.
+            latest = frame.groupby(group_cols + ["day"])[value_cols].last().reset_index()
+            segment = [table[col] for col in group_cols]
+            for col in value_cols:
+                table[col] = latest[col].groupby(segment).ffill()
+                table[f"{col}_day"] = table["day"].where(latest[col].notna()).groupby(segment).ffill()
+        return cls(table, sum_cols, value_cols)
+
+    def rebuilt_from(self, since: date, game_logs: pd.DataFrame) -> PrefixSumIndex:
+        """Rebuild the rows from ``since`` onward; ``game_logs`` must hold every log dated ``since`` or later.
+
+        Earlier rows are kept as they are and carried into the new ones, so only
+        the affected days are aggregated again.
+        """
+        group_cols = list(self.GROUP_COLS)
+        head = plain_columns(self.table[self.table["day"] < since.toordinal()])
+        if game_logs.empty:
+            return type(self)(head, self.sum_cols, self.value_cols)
+        tail = plain_columns(self.build(game_logs, self.sum_cols, self.value_cols).table)
+        if head.empty or tail.empty:
+            table = tail if head.empty else head
+            return type(self)(table, self.sum_cols, self.value_cols)
+
+        carry = head.drop_duplicates(group_cols, keep="last").drop(columns="day")
+        tail = tail.merge(carry, on=group_cols, how="left", suffixes=("", "_before"))
+        for col in self.sum_cols:
+            tail[col] = tail[col] + tail.pop(f"{col}_before").fillna(0).astype("int64")
+        for col in self.value_cols:
+            for name in (col, f"{col}_day"):
+                before = tail.pop(f"{name}_before")
+                tail[name] = tail[name].where(tail[name].notna(), before)
+        table = pd.concat([head, tail[head.columns]], ignore_index=True)
+        return type(self)(table.sort_values([*group_cols, "day"], ignore_index=True), self.sum_cols, self.value_cols)
+
+    @classmethod
+    def load(cls, path: Path) -> PrefixSumIndex:
+        table = pd.read_parquet(path)
+        value_cols = [col[: -len("_day")] for col in table.columns if col.endswith("_day")]
+        fixed = {*cls.GROUP_COLS, "day", *value_cols, *(f"{col}_day" for col in value_cols)}
+        sum_cols = [col for col in table.columns if col not in fixed]
+        return cls(table, sum_cols, value_cols)
+
+    def save(self, path: Path) -> None:
+        write_parquet_atomic(self.table, path)
+
+    def segment_sums(self, start_date: date, end_date: date, player_ids: Iterable[int] | None = None) -> pd.DataFrame:
+        """Totals per (player, league) segment with games between the two dates, inclusive."""
+        segments = np.arange(len(self.segment_starts))
+        if player_ids is not None:
+            segments = segments[np.isin(self.segment_player_ids, list(player_ids))]
+        base = segments * self.KEY_STRIDE
+        before = np.searchsorted(self.keys, base + start_date.toordinal(), side="left") - 1
+        through = np.searchsorted(self.keys, base + end_date.toordinal(), side="right") - 1
+        first = self.segment_starts[segments]
+        played = (through >= first) & (through > before)
+        before, through, first = before[played], through[played], first[played]
+
+        has_before = before >= first
+        rows = self.table.iloc[through]
+        result = pd.DataFrame({col: rows[col].to_numpy() for col in self.GROUP_COLS})
+        for col, running in self.totals.items():
+            totals = running[through]
+            totals[has_before] -= running[before[has_before]]
+            result[col] = totals
+        for col in self.value_cols:
+            recent = rows[f"{col}_day"].to_numpy(dtype="float64") >= start_date.toordinal()
+            result[col] = rows[col].where(recent).to_numpy()
+        return result
+
+    def window_sums(
+        self,
+        ranges: Iterable[tuple[date, date]],
+        player_ids: Iterable[int] | None = None,
+    ) -> pd.DataFrame:
+        """``segment_sums`` for each range, tagged with its position as ``window``."""
+        player_ids = None if player_ids is None else list(player_ids)
+        parts = [
+            self.segment_sums(start_date, end_date, player_ids).assign(window=position)
+            for position, (start_date, end_date) in enumerate(ranges)
+        ]
+        parts = [part for part in parts if not part.empty]
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+from mlb_stats_cache import JsonDirCache
+from mlb_stats_client import AdaptiveConcurrency, RateLimiter, StatsApiClient
+
+
+class DelayedSession:
+    """Stand-in for ``requests.Session`` that answers ``{}`` after each delay in turn."""
+
+    def __init__(self, delays: list[float], statuses: list[int] | None = None) -> None:
+        self.delays = list(delays)
+        self.statuses = list(statuses or [])
+        self.answered = threading.Event()
+
+    def get(self, url: str, headers: dict[str, str] | None = None, timeout: object = None) -> requests.Response:
+        time.sleep(self.delays.pop(0))
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0) if self.statuses else 200
+        self.answered.set()
+        response._content = b"{}"
+        response.url = url
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def make_client(
+    tmp_path: Path,
+    concurrency: AdaptiveConcurrency,
+    delays: list[float],
+    statuses: list[int] | None = None,
+    rate_limiter: RateLimiter | None = None,
+) -> StatsApiClient:
+    client = StatsApiClient(JsonDirCache(tmp_path), rate_limiter or RateLimiter(0), concurrency=concurrency)
+    client.session = DelayedSession(delays, statuses)  # type: ignore[assignment]
+    return client
+
+
+def test_slow_response_halves_concurrency(tmp_path: Path) -> None:
+    concurrency = AdaptiveConcurrency(8, initial=4, cooldown=0)
+    client = make_client(tmp_path, concurrency, [0.01] * 5 + [0.2])
+    for _ in range(5):
+        client.fetch_json("http://stats.test/fast")
+    limit = concurrency.limit
+    assert concurrency.decreases == 0
+
+    client.fetch_json("http://stats.test/slow")
+
+    assert concurrency.decreases == 1
+    assert concurrency.limit == limit / 2
+
+
+def test_fast_responses_raise_concurrency(tmp_path: Path) -> None:
+    concurrency = AdaptiveConcurrency(8, initial=2, cooldown=0)
+    client = make_client(tmp_path, concurrency, [0.01] * 6)
+    for _ in range(6):
+        client.fetch_json("http://stats.test/fast")
+
+    assert concurrency.decreases == 0
+    assert concurrency.limit > 2
+
+
+def test_retry_backoff_does_not_delay_other_requests(tmp_path: Path) -> None:
+    limiter = RateLimiter(10)
+    client = make_client(tmp_path, AdaptiveConcurrency(4, adaptive=False), [0, 0], [503, 200], limiter)
+    retrying = threading.Thread(target=client.fetch_json, args=("http://stats.test/flaky",))
+    retrying.start()
+    client.session.answered.wait(1)  # type: ignore[attr-defined]
+    time.sleep(0.2)
+
+    started = time.monotonic()
+    limiter.acquire()
+    waited = time.monotonic() - started
+    retrying.join()
+
+    assert waited < 0.5
+
+
+def test_concurrency_recovers_after_latency_rises() -> None:
+    # Fast schedule-sized responses first, then a steady stream of slower boxscore-sized ones.
+    concurrency = AdaptiveConcurrency(8, initial=4, cooldown=0)
+    for latency in [0.06] * 5 + [0.25] * 30 + [0.06, 0.25] * 15:
+        concurrency.acquire()
+        concurrency.release(latency, congested=False)
+
+    assert concurrency.decreases > 0
+    assert concurrency.limit == concurrency.maximum
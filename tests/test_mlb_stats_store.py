@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlb_stats_store import GameLogStore, PrefixSumIndex, RunManifest, plain_columns
+
+SUM_COLS = ["AB", "H", "HR"]
+VALUE_COLS = ["player_name", "Age"]
+FIRST_DAY = date(2025, 5, 1)
+
+
+@pytest.fixture
+def game_logs() -> pd.DataFrame:
+    """Random hitter-style logs: several players, some of whom change leagues, over 40 days."""
+    rng = np.random.default_rng(7)
+    rows = 600
+    player_ids = rng.integers(1, 25, rows)
+    frame = pd.DataFrame(
+        {
+            "game_pk": np.arange(rows, dtype="int64") + 1000,
+            "game_date": pd.to_datetime(FIRST_DAY) + pd.to_timedelta(rng.integers(0, 40, rows), unit="D"),
+            "player_id": player_ids.astype("int64"),
+            "league_id": (100 + (player_ids + rng.integers(0, 2, rows)) % 3).astype("int64"),
+            "player_name": [f"Player {player_id}" for player_id in player_ids],
+            "Age": np.where(rng.random(rows) < 0.3, np.nan, 20 + player_ids / 10),
+        }
+    )
+    for col in SUM_COLS:
+        frame[col] = rng.integers(0, 5, rows).astype("int16")
+    return frame.sort_values("game_date", kind="stable", ignore_index=True)
+
+
+def direct_sums(game_logs: pd.DataFrame, start_date: date, end_date: date) -> pd.DataFrame:
+    """Reference totals: a plain groupby over the logs in the range."""
+    in_range = game_logs[
+        (game_logs["game_date"] >= pd.Timestamp(start_date)) & (game_logs["game_date"] <= pd.Timestamp(end_date))
+    ]
+    grouped = in_range.groupby(["player_id", "league_id"])
+    result = grouped[SUM_COLS].sum().astype("int64")
+    for col in VALUE_COLS:
+        result[col] = grouped[col].last()
+    return result.reset_index()
+
+
+def sorted_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    return plain_columns(frame).sort_values(["player_id", "league_id"], ignore_index=True)
+
+
+@pytest.mark.parametrize("since", [FIRST_DAY, FIRST_DAY + timedelta(days=17), FIRST_DAY + timedelta(days=39)])
+def test_rebuilt_from_matches_full_build(game_logs: pd.DataFrame, since: date) -> None:
+    full = PrefixSumIndex.build(game_logs, SUM_COLS, VALUE_COLS)
+    # An out-of-date index: every log before ``since`` but only some of the later ones.
+    later = game_logs["game_date"] >= pd.Timestamp(since)
+    stale = PrefixSumIndex.build(game_logs[~later | (game_logs.index % 3 == 0)], SUM_COLS, VALUE_COLS)
+
+    rebuilt = stale.rebuilt_from(since, game_logs[later])
+
+    pd.testing.assert_frame_equal(
+        plain_columns(rebuilt.table), plain_columns(full.table)[rebuilt.table.columns], check_dtype=False
+    )
+
+
+def test_segment_sums_match_groupby(game_logs: pd.DataFrame) -> None:
+    index = PrefixSumIndex.build(game_logs, SUM_COLS, VALUE_COLS)
+    for start_date, end_date in [
+        (FIRST_DAY, FIRST_DAY + timedelta(days=39)),
+        (FIRST_DAY + timedelta(days=10), FIRST_DAY + timedelta(days=16)),
+        (FIRST_DAY + timedelta(days=25), FIRST_DAY + timedelta(days=25)),
+    ]:
+        expected = direct_sums(game_logs, start_date, end_date)
+        actual = index.segment_sums(start_date, end_date)
+        pd.testing.assert_frame_equal(
+            sorted_frame(actual), sorted_frame(expected)[actual.columns], check_dtype=False
+        )
+
+
+def test_window_sums_match_groupby_for_selected_players(game_logs: pd.DataFrame) -> None:
+    index = PrefixSumIndex.build(game_logs, SUM_COLS, VALUE_COLS)
+    end_date = FIRST_DAY + timedelta(days=39)
+    ranges = [(end_date - timedelta(days=days), end_date) for days in (7, 15, 30)]
+    player_ids = [3, 8, 21]
+
+    sums = index.window_sums(ranges, player_ids)
+
+    for position, (start_date, range_end) in enumerate(ranges):
+        expected = direct_sums(game_logs, start_date, range_end)
+        expected = expected[expected["player_id"].isin(player_ids)]
+        actual = sums[sums["window"] == position].drop(columns="window")
+        pd.testing.assert_frame_equal(
+            sorted_frame(actual), sorted_frame(expected)[actual.columns], check_dtype=False
+        )
+
+
+def test_game_log_store_replaces_reparsed_games(tmp_path: Path, game_logs: pd.DataFrame) -> None:
+    store = GameLogStore(tmp_path)
+    first = game_logs[game_logs["game_pk"] < 1010]
+    games = [(int(row.game_pk), row.game_date.date(), 11, f"hash-{row.game_pk}") for row in first.itertuples()]
+    store.append(games, first, first.iloc[:0])
+
+    revised = first.iloc[:1].assign(H=9)
+    store.append([(games[0][0], games[0][1], 11, "hash-new")], revised, first.iloc[:0])
+
+    reopened = GameLogStore(tmp_path)
+    loaded = reopened.load("hitters", FIRST_DAY, FIRST_DAY + timedelta(days=39))
+    assert sorted(loaded["game_pk"]) == sorted(first["game_pk"])
+    assert loaded.loc[loaded["game_pk"] == games[0][0], "H"].tolist() == [9]
+    assert reopened.content_hash(games[0][0]) == "hash-new"
+    assert games[1][0] in reopened
+
+
+def test_run_manifest_resumes_only_unfinished_runs(tmp_path: Path) -> None:
+    path = tmp_path / "run_manifest.json"
+    manifest = RunManifest(path, {"end_date": "2025-07-01"})
+    manifest.mark(1, "written")
+    manifest.mark(2, "failed")
+    manifest.save()
+
+    resumed = RunManifest(path, {"end_date": "2025-07-01"})
+    assert resumed.resumed
+    assert resumed.is_done(1) and not resumed.is_done(2)
+    assert not RunManifest(path, {"end_date": "2025-07-02"}).resumed
+
+    resumed.save(complete=True)
+    assert not RunManifest(path, {"end_date": "2025-07-01"}).resumed